@@ -1,7 +1,11 @@
 import pygame
 import random
 import os
+import sys
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from arcade_audio import SoundBank
+from arcade_scores import Leaderboard
 from objects import Player, Bar, Ball, Block, ScoreCard, Message, Particle, generate_particles
 
 def parse_window_size(raw_value):
@@ -61,9 +65,10 @@ c_list = [RED, BLACK, WHITE]
 pygame.font.init()
 score_font = pygame.font.Font('Fonts/BubblegumSans-Regular.ttf', 50)
 
-coin_fx = pygame.mixer.Sound('Sounds/coin.mp3')
-death_fx = pygame.mixer.Sound('Sounds/death.mp3')
-move_fx = pygame.mixer.Sound('Sounds/move.mp3')
+sounds = SoundBank()
+sounds.load('coin', 'Sounds/coin.mp3')
+sounds.load('death', 'Sounds/death.mp3', category='event')
+sounds.load('move', 'Sounds/move.mp3', category='ui', max_voices=1)
 
 bg_list = []
 for i in range(1,5):
@@ -120,6 +125,7 @@ score_page = False
 bird_dead = False
 score = 0
 high_score = 0
+leaderboard = Leaderboard('angry-walls')
 move_left = False
 move_right = True
 prev_x = 0
@@ -129,6 +135,7 @@ score_list = []
 def start_round():
 	global home_page, score_page, bg, particles, last_bar, next_bar, bar_speed, bar_frequency
 	global bird_dead, score, p_count, score_list, touched, prev_x, move_left, move_right
+	global high_score
 
 	home_page = False
 	score_page = False
@@ -149,6 +156,7 @@ def start_round():
 	p_count = 0
 	score_list = []
 	touched = False
+	high_score = max(high_score, leaderboard.best())
 	move_left = False
 	move_right = True
 
@@ -172,11 +180,11 @@ def set_move_direction(direction):
 	if direction < 0 and not move_left:
 		move_left = True
 		move_right = False
-		move_fx.play()
+		sounds.play('move')
 	elif direction > 0 and not move_right:
 		move_right = True
 		move_left = False
-		move_fx.play()
+		sounds.play('move')
 
 def get_horizontal_input():
 	direction = 0
@@ -306,14 +314,14 @@ while running:
 			if ball.rect.colliderect(p):
 				if ball.color == "white":
 					ball.kill()
-					coin_fx.play()
+					sounds.play('coin')
 					score += 1
 					if score > high_score:
 						high_score += 1
 					score_card.animate = True
 				elif ball.color == "red":
 					if not bird_dead:
-						death_fx.play()
+						sounds.play('death')
 						destroy_bird()
 							
 					bird_dead = True
@@ -321,7 +329,7 @@ while running:
 	
 		if pygame.sprite.spritecollide(p, bar_group, False):
 			if not bird_dead:
-				death_fx.play()
+				sounds.play('death')
 				destroy_bird()
 					
 			bird_dead = True
@@ -351,6 +359,7 @@ while running:
 				
 		if bird_dead and len(destruct_group) == 0:
 			score_page = True
+			leaderboard.submit(score)
 			font =  "Fonts/BubblegumSans-Regular.ttf"
 			if score < high_score:
 				score_msg = Message(WIDTH // 2, int(60 * scale_y), int(55 * scale_y), "Score",font, WHITE, win)
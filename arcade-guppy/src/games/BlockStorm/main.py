@@ -1,6 +1,10 @@
 import pygame
 import random
 import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from arcade_scores import Leaderboard
 
 def parse_window_size(raw_value):
 	if not raw_value:
@@ -151,6 +155,7 @@ class Tetris:
 		self.new_figure()
 		if self.intersects():
 			self.gameover = True
+			leaderboard.submit(self.score)
 
 	def go_space(self):
 		while not self.intersects():
@@ -175,6 +180,7 @@ class Tetris:
 		if self.intersects():
 			self.figure.rotation = rotation
 
+leaderboard = Leaderboard('block-storm')
 counter = 0
 move_down = False
 can_move = True
@@ -251,10 +257,12 @@ while running:
 		pygame.draw.rect(win, RED, rect, 2)
 
 		over = font2.render('Game Over', True, WHITE)
+		best = font2.render(f'Best : {leaderboard.best()}', True, WHITE)
 		msg1 = font2.render('Press r to restart', True, RED)
 		msg2 = font2.render('Press q to quit', True, RED)
 
 		win.blit(over, (rect.centerx-over.get_width()/2, rect.y + 20))
+		win.blit(best, (rect.centerx-best.get_width()/2, rect.y + 50))
 		win.blit(msg1, (rect.centerx-msg1.get_width()/2, rect.y + 80))
 		win.blit(msg2, (rect.centerx-msg2.get_width()/2, rect.y + 110))
 
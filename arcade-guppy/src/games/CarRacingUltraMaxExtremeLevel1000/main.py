@@ -1,6 +1,10 @@
 import pygame
 import random
 import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from arcade_audio import SoundBank
 from objects import Road, Player, Nitro, Tree, Button, \
 					Obstacle, Coins, Fuel
 
@@ -93,11 +97,12 @@ home_btn = Button(home_btn_img, (24, 24), WIDTH // 4 - 18, HEIGHT - 80)
 replay_btn = Button(replay_img, (36,36), WIDTH // 2  - 18, HEIGHT - 86)
 sound_btn = Button(sound_on_img, (24, 24), WIDTH - WIDTH // 4 - 18, HEIGHT - 80)
 
-click_fx = pygame.mixer.Sound('Sounds/click.mp3')
-fuel_fx = pygame.mixer.Sound('Sounds/fuel.wav')
-start_fx = pygame.mixer.Sound('Sounds/start.mp3')
-restart_fx = pygame.mixer.Sound('Sounds/restart.mp3')
-coin_fx = pygame.mixer.Sound('Sounds/coin.mp3')
+sounds = SoundBank()
+sounds.load('click', 'Sounds/click.mp3', category='ui', max_voices=1)
+sounds.load('fuel', 'Sounds/fuel.wav')
+sounds.load('start', 'Sounds/start.mp3', category='event', max_voices=1)
+sounds.load('restart', 'Sounds/restart.mp3', category='event', max_voices=1)
+sounds.load('coin', 'Sounds/coin.mp3')
 
 pygame.mixer.music.load('Sounds/mixkit-tech-house-vibes-130.mp3')
 pygame.mixer.music.play(loops=-1)
@@ -194,13 +199,13 @@ while running:
 		win.blit(cars[car_type], (WIDTH//2-30, 150))
 		if la_btn.draw(win):
 			car_type -= 1
-			click_fx.play()
+			sounds.play('click')
 			if car_type < 0:
 				car_type = len(cars) - 1
 
 		if ra_btn.draw(win):
 			car_type += 1
-			click_fx.play()
+			sounds.play('click')
 			if car_type >= len(cars):
 				car_type = 0
 
@@ -208,7 +213,7 @@ while running:
 			car_page = False
 			game_page = True
 
-			start_fx.play()
+			sounds.play('start')
 
 			p = Player(int(100 * scale_x), HEIGHT - int(120 * scale_y), car_type)
 			counter = 0
@@ -259,7 +264,7 @@ while running:
 			endx, enddx = 0, 0.5
 			gameovery = -50
 
-			restart_fx.play()
+			sounds.play('restart')
 
 		if sound_btn.draw(win):
 			sound_on = not sound_on
@@ -349,11 +354,11 @@ while running:
 
 		if pygame.sprite.spritecollide(p, coin_group, True):
 			coins += 1
-			coin_fx.play()
+			sounds.play('coin')
 
 		if pygame.sprite.spritecollide(p, fuel_group, True):
 			cfuel += 25
-			fuel_fx.play()
+			sounds.play('fuel')
 			if cfuel >= 100:
 				cfuel = 100
 
@@ -1,21 +1,49 @@
   
+import glob
+import hashlib
+import inspect
+import json
 import os
+import pickle
+import random
+import sys
+from array import array
+from collections import deque
 import pygame
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from arcade_input import JoystickManager
 pygame.init()
-pygame.joystick.init()
 JOYSTICK_DEADZONE = 0.3
-JOYSTICK_SPEED = 30
-active_js_index = None
-def _refresh_joysticks():
-  return [pygame.joystick.Joystick(i) for i in range(pygame.joystick.get_count())]
-for js in _refresh_joysticks():
-  js.init()
-
-def _js_id(js):
-  if hasattr(js, "get_instance_id"):
-    try: return js.get_instance_id()
-    except TypeError: pass
-  return js.get_id()
+DEBUG_COLLISIONS = os.environ.get("PACMAN_DEBUG_COLLISIONS", "0") == "1"
+# classic mode keeps the original 10 Hz tile-jump movement and hold-to-move controls
+CLASSIC_MODE = os.environ.get("PACMAN_CLASSIC", "0") == "1"
+TICK_RATE = 10 if CLASSIC_MODE else 60
+RENDER_FPS = 10 if CLASSIC_MODE else 120
+# stretch (default), fit or integer; nearest (default) or smooth
+SCALE_MODE = os.environ.get("PACMAN_SCALE", "stretch").strip().lower()
+SCALE_FILTER = os.environ.get("PACMAN_SCALE_FILTER", "nearest").strip().lower()
+MAX_FRAME_TIME = 0.25
+# px per simulation tick; both modes move Pacman 300 px/s and ghosts 150 px/s
+PACMAN_SPEED = 300 / TICK_RATE
+GHOST_SPEED = 150 / TICK_RATE
+TILE_SIZE = 30
+TILE_ORIGIN = (17, 19)
+MAZE_TILES = 19
+DIRECTIONS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+OPPOSITE = (1, 0, 3, 2)
+ARROW_KEYS = {pygame.K_LEFT: 0, pygame.K_RIGHT: 1, pygame.K_UP: 2, pygame.K_DOWN: 3}
+UNREACHABLE = 0xFFFF
+# (seconds, mode) pairs; the last mode holds for the rest of the round
+MODE_SCHEDULE = ((7, "scatter"), (20, "chase"), (7, "scatter"), (20, "chase"), (5, "scatter"), (None, "chase"))
+FRIGHTENED_SECONDS = 6
+PELLET = 1
+POWER_PELLET = 2
+ghost_rng = random.Random()
+MAZE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "mazes")
+# caches are also keyed on the compiler's code and constants; bump only when the pickled format changes
+MAZE_CACHE_VERSION = 1
+MAZE_CACHE_SUFFIX = ".compiled"
+joypad = JoystickManager(JOYSTICK_DEADZONE)
 
 black = (0,0,0)
 white = (255,255,255)
@@ -31,248 +59,333 @@ try:
     pygame.mixer.music.play(-1, 0.0)
 except pygame.error:
     pass
-class Wall(pygame.sprite.Sprite):
-    def __init__(self,x,y,width,height, color):
-        pygame.sprite.Sprite.__init__(self)
-        self.image = pygame.Surface([width, height])
-        self.image.fill(color)
-        self.rect = self.image.get_rect()
-        self.rect.top = y
-        self.rect.left = x
-def setupRoomOne(all_sprites_list):
-    wall_list=pygame.sprite.RenderPlain()
-    walls = [ [0,0,6,600],
-              [0,0,600,6],
-              [0,600,606,6],
-              [600,0,6,606],
-              [300,0,6,66],
-              [60,60,186,6],
-              [360,60,186,6],
-              [60,120,66,6],
-              [60,120,6,126],
-              [180,120,246,6],
-              [300,120,6,66],
-              [480,120,66,6],
-              [540,120,6,126],
-              [120,180,126,6],
-              [120,180,6,126],
-              [360,180,126,6],
-              [480,180,6,126],
-              [180,240,6,126],
-              [180,360,246,6],
-              [420,240,6,126],
-              [240,240,42,6],
-              [324,240,42,6],
-              [240,240,6,66],
-              [240,300,126,6],
-              [360,240,6,66],
-              [0,300,66,6],
-              [540,300,66,6],
-              [60,360,66,6],
-              [60,360,6,186],
-              [480,360,66,6],
-              [540,360,6,186],
-              [120,420,366,6],
-              [120,420,6,66],
-              [480,420,6,66],
-              [180,480,246,6],
-              [300,480,6,66],
-              [120,540,126,6],
-              [360,540,126,6]
-            ]
-    for item in walls:
-        wall=Wall(item[0],item[1],item[2],item[3],blue)
-        wall_list.add(wall)
-        all_sprites_list.add(wall)
-    return wall_list
-
-def setupGate(all_sprites_list):
-      gate = pygame.sprite.RenderPlain()
-      gate.add(Wall(282,242,42,2,white))
-      all_sprites_list.add(gate)
-      return gate
-class Block(pygame.sprite.Sprite):
-    def __init__(self, color, width, height):
-        pygame.sprite.Sprite.__init__(self) 
-        self.image = pygame.Surface([width, height])
-        self.image.fill(white)
-        self.image.set_colorkey(white)
-        pygame.draw.ellipse(self.image,color,[0,0,width,height])
-        self.rect = self.image.get_rect() 
+class CollisionGrid:
+    """Summed-area table over the maze's 6 px wall lattice; rect queries are O(1)"""
+    def __init__(self, walls, width, height, cell=6):
+        self.walls = walls
+        self.cell = cell
+        self.cols = -(-width // cell)
+        self.rows = -(-height // cell)
+        occupied = [[0] * self.cols for _ in range(self.rows)]
+        for wall in walls:
+            for row in range(wall.top // cell, -(-wall.bottom // cell)):
+                for col in range(wall.left // cell, -(-wall.right // cell)):
+                    if row < self.rows and col < self.cols:
+                        occupied[row][col] = 1
+        self.sums = [[0] * (self.cols + 1) for _ in range(self.rows + 1)]
+        for row in range(self.rows):
+            running = 0
+            for col in range(self.cols):
+                running += occupied[row][col]
+                self.sums[row + 1][col + 1] = self.sums[row][col + 1] + running
+
+    def blocked(self, rect):
+        cell = self.cell
+        left = max(0, rect.left // cell)
+        top = max(0, rect.top // cell)
+        right = min(self.cols, (rect.right - 1) // cell + 1)
+        bottom = min(self.rows, (rect.bottom - 1) // cell + 1)
+        if left >= right or top >= bottom:
+            return False
+        sums = self.sums
+        hit = sums[bottom][right] - sums[top][right] - sums[bottom][left] + sums[top][left] > 0
+        if DEBUG_COLLISIONS and hit != (rect.collidelist(self.walls) != -1):
+            print(f"[PACMAN] collision grid mismatch at {rect}")
+        return hit
+
 class Player(pygame.sprite.Sprite):
-    change_x=0
-    change_y=0
-    def __init__(self,x,y, filename):
+    def __init__(self, x, y, filename, speed=PACMAN_SPEED):
         pygame.sprite.Sprite.__init__(self)
         self.image = pygame.image.load(filename).convert()
         self.rect = self.image.get_rect()
         self.rect.top = y
         self.rect.left = x
-        self.prev_x = x
-        self.prev_y = y
-    def prevdirection(self):
-        self.prev_x = self.change_x
-        self.prev_y = self.change_y
-    def changespeed(self,x,y):
-        self.change_x+=x
-        self.change_y+=y
-    def update(self,walls,gate):
-        
-        old_x=self.rect.left
-        new_x=old_x+self.change_x
-        prev_x=old_x+self.prev_x
-        self.rect.left = new_x
-        
-        old_y=self.rect.top
-        new_y=old_y+self.change_y
-        prev_y=old_y+self.prev_y
-        x_collide = pygame.sprite.spritecollide(self, walls, False)
-        if x_collide:
-            self.rect.left=old_x
-        else:
-
-            self.rect.top = new_y
-            y_collide = pygame.sprite.spritecollide(self, walls, False)
-            if y_collide:
-                self.rect.top=old_y
-
-        if gate != False:
-          gate_hit = pygame.sprite.spritecollide(self, gate, False)
-          if gate_hit:
-            self.rect.left=old_x
-            self.rect.top=old_y
+        self.prev_pos = (x, y)
+        self.speed = speed
+        self.budget = 0.0
+        self.direction = None
+        self.wanted = None
+
+    def advance(self, maze):
+        # move one pixel at a time so every tile centre is seen and turns happen exactly on it
+        self.prev_pos = self.rect.topleft
+        self.budget += self.speed
+        while self.budget >= 1:
+            tile = tile_at(self.rect)
+            if tile is not None:
+                self.direction = self.choose(maze, maze.index[tile])
+            elif self.wanted is not None and self.direction is not None and self.wanted == OPPOSITE[self.direction]:
+                self.direction = self.wanted
+            if self.direction is None:
+                self.budget = 0.0
+                return
+            dx, dy = DIRECTIONS[self.direction]
+            self.rect.move_ip(dx, dy)
+            self.budget -= 1
+
+    def choose(self, maze, here):
+        # a buffered turn is taken at the first tile that allows it
+        exits = maze.pacman_exits[here]
+        if self.wanted in exits:
+            return self.wanted
+        if self.direction in exits and not CLASSIC_MODE:
+            return self.direction
+        return None
+
+    def draw_pos(self, alpha):
+        x, y = self.prev_pos
+        return (round(x + (self.rect.left - x) * alpha), round(y + (self.rect.top - y) * alpha))
+
 class Ghost(Player):
-    def changespeed(self,list,ghost,turn,steps,l):
-      try:
-        z=list[turn][2]
-        if steps < z:
-          self.change_x=list[turn][0]
-          self.change_y=list[turn][1]
-          steps+=1
-        else:
-          if turn < l:
-            turn+=1
-          elif ghost == "clyde":
-            turn = 2
-          else:
-            turn = 0
-          self.change_x=list[turn][0]
-          self.change_y=list[turn][1]
-          steps = 0
-        return [turn,steps]
-      except IndexError:
-         return [0,0]
-
-Pinky_directions = [
-[0,-30,4],
-[15,0,9],
-[0,15,11],
-[-15,0,23],
-[0,15,7],
-[15,0,3],
-[0,-15,3],
-[15,0,19],
-[0,15,3],
-[15,0,3],
-[0,15,3],
-[15,0,3],
-[0,-15,15],
-[-15,0,7],
-[0,15,3],
-[-15,0,19],
-[0,-15,11],
-[15,0,9]
-]
-
-Blinky_directions = [
-[0,-15,4],
-[15,0,9],
-[0,15,11],
-[15,0,3],
-[0,15,7],
-[-15,0,11],
-[0,15,3],
-[15,0,15],
-[0,-15,15],
-[15,0,3],
-[0,-15,11],
-[-15,0,3],
-[0,-15,11],
-[-15,0,3],
-[0,-15,3],
-[-15,0,7],
-[0,-15,3],
-[15,0,15],
-[0,15,15],
-[-15,0,3],
-[0,15,3],
-[-15,0,3],
-[0,-15,7],
-[-15,0,3],
-[0,15,7],
-[-15,0,11],
-[0,-15,7],
-[15,0,5]
-]
-
-Inky_directions = [
-[30,0,2],
-[0,-15,4],
-[15,0,10],
-[0,15,7],
-[15,0,3],
-[0,-15,3],
-[15,0,3],
-[0,-15,15],
-[-15,0,15],
-[0,15,3],
-[15,0,15],
-[0,15,11],
-[-15,0,3],
-[0,-15,7],
-[-15,0,11],
-[0,15,3],
-[-15,0,11],
-[0,15,7],
-[-15,0,3],
-[0,-15,3],
-[-15,0,3],
-[0,-15,15],
-[15,0,15],
-[0,15,3],
-[-15,0,15],
-[0,15,11],
-[15,0,3],
-[0,-15,11],
-[15,0,11],
-[0,15,3],
-[15,0,1],
-]
-
-Clyde_directions = [
-[-30,0,2],
-[0,-15,4],
-[15,0,5],
-[0,15,7],
-[-15,0,11],
-[0,-15,7],
-[-15,0,3],
-[0,15,7],
-[-15,0,7],
-[0,15,15],
-[15,0,15],
-[0,-15,3],
-[-15,0,11],
-[0,-15,7],
-[15,0,3],
-[0,-15,11],
-[15,0,9],
-]
-
-pl = len(Pinky_directions)-1
-bl = len(Blinky_directions)-1
-il = len(Inky_directions)-1
-cl = len(Clyde_directions)-1
+    def __init__(self, x, y, filename, name, corner, release_seconds):
+        Player.__init__(self, x, y, filename, GHOST_SPEED)
+        self.normal_image = self.image
+        self.frightened_image = self.image.copy()
+        self.frightened_image.fill((70, 70, 255), special_flags=pygame.BLEND_MULT)
+        self.start = (x, y)
+        self.name = name
+        self.corner = corner
+        self.release_frame = int(release_seconds * TICK_RATE)
+        self.frightened = False
+        self.target = None
+
+    def set_frightened(self, frightened):
+        if frightened and self.direction is not None:
+            self.direction = OPPOSITE[self.direction]
+        self.frightened = frightened
+        self.image = self.frightened_image if frightened else self.normal_image
+
+    def send_home(self):
+        self.rect.topleft = self.start
+        self.prev_pos = self.start
+        self.direction = None
+        self.budget = 0.0
+        self.set_frightened(False)
+
+    def steer(self, maze, target, frame):
+        if frame < self.release_frame:
+            self.prev_pos = self.rect.topleft
+            return
+        self.target = target
+        self.advance(maze)
+
+    def choose(self, maze, here):
+        heading = 4 if self.direction is None else self.direction
+        exits = maze.exits[here][heading]
+        if len(exits) == 1:
+            return exits[0]
+        if self.frightened:
+            return ghost_rng.choice(exits)
+        goal = maze.index[self.target]
+        return min(exits, key=lambda d: maze.distance(maze.neighbours[here][d], goal))
+
+def tile_rect(col, row):
+  return pygame.Rect(TILE_ORIGIN[0] + col * TILE_SIZE, TILE_ORIGIN[1] + row * TILE_SIZE, 32, 32)
+
+def tile_at(rect):
+  col, x_off = divmod(rect.left - TILE_ORIGIN[0], TILE_SIZE)
+  row, y_off = divmod(rect.top - TILE_ORIGIN[1], TILE_SIZE)
+  if x_off or y_off:
+    return None
+  return (col, row)
+
+def pellet_rect(col, row, kind):
+  if kind == POWER_PELLET:
+    rect = pygame.Rect(0, 0, 10, 10)
+    rect.center = (30 * col + 34, 30 * row + 34)
+    return rect
+  return pygame.Rect(30 * col + 32, 30 * row + 32, 4, 4)
+
+def build_pellet_mask(walls, graph, start_rect, power_pellets):
+  # one byte per cell of the 19x19 pellet lattice: 0 empty, PELLET or POWER_PELLET
+  mask = bytearray(MAZE_TILES * MAZE_TILES)
+  enclosed = {graph.tiles[i] for i in graph.house | graph.gates}
+  for row in range(MAZE_TILES):
+    for col in range(MAZE_TILES):
+      if (col, row) in enclosed:
+        continue
+      kind = POWER_PELLET if (col, row) in power_pellets else PELLET
+      rect = pellet_rect(col, row, kind)
+      if walls.blocked(rect) or rect.colliderect(start_rect):
+        continue
+      mask[row * MAZE_TILES + col] = kind
+  return mask
+
+def eat_pellets(pellets, rect):
+  # only the few lattice cells whose pellet core can overlap rect are checked
+  eaten = []
+  for row in range(max(0, (rect.top - 36) // 30 + 1), min(MAZE_TILES, (rect.bottom - 33) // 30 + 1)):
+    for col in range(max(0, (rect.left - 36) // 30 + 1), min(MAZE_TILES, (rect.right - 33) // 30 + 1)):
+      index = row * MAZE_TILES + col
+      kind = pellets[index]
+      if kind:
+        pellets[index] = 0
+        eaten.append((col, row, kind))
+  return eaten
+
+def nearest_tile(rect):
+  return ((rect.left - TILE_ORIGIN[0] + TILE_SIZE // 2) // TILE_SIZE,
+          (rect.top - TILE_ORIGIN[1] + TILE_SIZE // 2) // TILE_SIZE)
+
+class MazeGraph:
+    """Walkable tiles of the maze with per-heading exits and all-pairs shortest-path distances"""
+    def __init__(self, walls, gate_rects, start_tile, size=MAZE_TILES):
+        self.size = size
+        self.tiles = [(col, row) for row in range(size) for col in range(size)
+                      if not walls.blocked(tile_rect(col, row))]
+        self.index = {tile: i for i, tile in enumerate(self.tiles)}
+        self.gates = {self.index[tile] for tile in self.tiles if tile_rect(*tile).collidelist(gate_rects) != -1}
+        self.neighbours = [[self.index.get((col + dx, row + dy)) for dx, dy in DIRECTIONS]
+                           for col, row in self.tiles]
+
+        # the playable area is whatever Pacman can reach from his start tile
+        outside = self._flood(self.index[start_tile], blocked=self.gates)
+        self.house = set(range(len(self.tiles))) - outside - self.gates
+        self.pacman_exits = [tuple(d for d, n in enumerate(links) if n in outside) for links in self.neighbours]
+        self.exits = [[self._exits(i, heading) for heading in range(5)] for i in range(len(self.tiles))]
+
+        count = len(self.tiles)
+        self.dist = array('H', [UNREACHABLE]) * (count * count)
+        for source in range(count):
+            self._bfs(source)
+
+        outside_tiles = [self.tiles[i] for i in sorted(outside)]
+        self.nearest = {}
+        for row in range(size):
+            for col in range(size):
+                self.nearest[(col, row)] = min(outside_tiles, key=lambda t: abs(t[0] - col) + abs(t[1] - row))
+
+    def distance(self, a, b):
+        return self.dist[a * len(self.tiles) + b]
+
+    def target(self, col, row):
+        return self.nearest[(min(max(col, 0), self.size - 1), min(max(row, 0), self.size - 1))]
+
+    def _flood(self, start, blocked):
+        seen = {start}
+        pending = [start]
+        while pending:
+            for n in self.neighbours[pending.pop()]:
+                if n is not None and n not in seen and n not in blocked:
+                    seen.add(n)
+                    pending.append(n)
+        return seen
+
+    def _exits(self, here, heading):
+        # ghosts never reverse and only pass a gate on their way out of the house
+        options = []
+        for d, n in enumerate(self.neighbours[here]):
+            if n is None or (heading < 4 and d == OPPOSITE[heading]):
+                continue
+            if n in self.gates and here not in self.house:
+                continue
+            options.append(d)
+        if not options and heading < 4:
+            options.append(OPPOSITE[heading])
+        return tuple(options)
+
+    def _bfs(self, source):
+        count = len(self.tiles)
+        base = source * count
+        self.dist[base + source] = 0
+        queue = deque([source])
+        while queue:
+            here = queue.popleft()
+            step = self.dist[base + here] + 1
+            for n in self.neighbours[here]:
+                if n is not None and self.dist[base + n] == UNREACHABLE:
+                    self.dist[base + n] = step
+                    queue.append(n)
+
+def chase_target(ghost, maze, pacman_tile, heading, blinky_tile):
+  col, row = pacman_tile
+  dx, dy = heading
+  if ghost.name == "pinky":
+    return maze.target(col + 4 * dx, row + 4 * dy)
+  if ghost.name == "inky":
+    pivot_col, pivot_row = col + 2 * dx, row + 2 * dy
+    return maze.target(2 * pivot_col - blinky_tile[0], 2 * pivot_row - blinky_tile[1])
+  if ghost.name == "clyde":
+    ghost_col, ghost_row = nearest_tile(ghost.rect)
+    if abs(col - ghost_col) + abs(row - ghost_row) < 8:
+      return ghost.corner
+  return maze.target(col, row)
+
+class CompiledMaze:
+    """A maze file compiled into wall rects, collision grid, nav graph and pellet mask"""
+    def __init__(self, data):
+        self.name = data.get("name", "maze")
+        self.walls = [pygame.Rect(wall) for wall in data["walls"]]
+        self.gates = [pygame.Rect(gate) for gate in data.get("gates", [])]
+        self.grid = CollisionGrid(self.walls, LOGICAL_WIDTH, LOGICAL_HEIGHT)
+        for name, tile in data["starts"].items():
+            col, row = tile
+            if not (0 <= col < MAZE_TILES and 0 <= row < MAZE_TILES) or self.grid.blocked(tile_rect(col, row)):
+                raise ValueError(f"maze {self.name!r}: start tile {tile} for {name} is not walkable")
+        self.starts = {name: tile_rect(*tile).topleft for name, tile in data["starts"].items()}
+        self.graph = MazeGraph(self.grid, self.gates, tuple(data["starts"]["pacman"]))
+        # corners on walls or inside the house snap to the nearest tile ghosts can target
+        self.scatter = {name: self.graph.target(*tile) for name, tile in data["scatter"].items()}
+        power_pellets = {tuple(tile) for tile in data.get("power_pellets", [])}
+        self.pellet_mask = build_pellet_mask(self.grid, self.graph, pygame.Rect(self.starts["pacman"], (32, 32)), power_pellets)
+        self.pellet_total = len(self.pellet_mask) - self.pellet_mask.count(0)
+
+def maze_compiler_digest():
+  # the compiled data depends on this code and these constants as much as on the maze file,
+  # so editing any of them invalidates every cache without a manual MAZE_CACHE_VERSION bump
+  parts = [repr((MAZE_CACHE_VERSION, TILE_SIZE, TILE_ORIGIN, MAZE_TILES, DIRECTIONS, UNREACHABLE,
+                 PELLET, POWER_PELLET, LOGICAL_WIDTH, LOGICAL_HEIGHT))]
+  for compiler in (CollisionGrid, MazeGraph, CompiledMaze, tile_rect, tile_at, pellet_rect, nearest_tile, build_pellet_mask):
+    try:
+      parts.append(inspect.getsource(compiler))
+    except (OSError, TypeError):
+      parts.append(compiler.__qualname__)
+  return hashlib.sha1("\n".join(parts).encode("utf-8")).hexdigest()
+
+def load_maze(path):
+  global maze_compiler_key
+  if maze_compiler_key is None:
+    maze_compiler_key = maze_compiler_digest()
+  with open(path, "rb") as handle:
+    source = handle.read()
+  digest = hashlib.sha1(source + maze_compiler_key.encode("ascii")).hexdigest()
+  cache_path = path + MAZE_CACHE_SUFFIX
+  try:
+    with open(cache_path, "rb") as handle:
+      version, cached_digest, compiled = pickle.load(handle)
+    if version == MAZE_CACHE_VERSION and cached_digest == digest:
+      return compiled
+  except (OSError, EOFError, ValueError, AttributeError, ImportError, pickle.UnpicklingError):
+    pass
+
+  compiled = CompiledMaze(json.loads(source))
+  try:
+    with open(cache_path + ".tmp", "wb") as handle:
+      pickle.dump((MAZE_CACHE_VERSION, digest, compiled), handle, pickle.HIGHEST_PROTOCOL)
+    os.replace(cache_path + ".tmp", cache_path)
+  except OSError as error:
+    print(f"[PACMAN] Could not cache compiled maze {cache_path}: {error}")
+  return compiled
+maze_compiler_key = None
+
+def render_pellet_layer(level):
+  layer = pygame.Surface((LOGICAL_WIDTH, LOGICAL_HEIGHT)).convert()
+  layer.fill(black)
+  for rect in level.walls:
+    layer.fill(blue, rect)
+  for rect in level.gates:
+    layer.fill(white, rect)
+  for index, kind in enumerate(level.pellet_mask):
+    if kind:
+      pygame.draw.ellipse(layer, yellow, pellet_rect(index % MAZE_TILES, index // MAZE_TILES, kind))
+  return layer
+
+def scheduled_mode(frame):
+  for seconds, mode in MODE_SCHEDULE:
+    if seconds is None or frame < seconds * TICK_RATE:
+      return mode
+    frame -= seconds * TICK_RATE
+  return MODE_SCHEDULE[-1][1]
 
 LOGICAL_WIDTH = 606
 LOGICAL_HEIGHT = 606
@@ -310,16 +423,43 @@ def init_display_surface():
     return pygame.display.set_mode(requested_size, flags)
   return pygame.display.set_mode((0, 0), flags)
 
-def present_frame():
+def compute_layout(window_size):
+  # stretch fills the window; fit and integer keep the square maze and letterbox the rest
+  if SCALE_MODE not in ("fit", "integer"):
+    return (0, 0), window_size
+  width, height = window_size
+  factor = min(width / LOGICAL_WIDTH, height / LOGICAL_HEIGHT)
+  if SCALE_MODE == "integer" and factor >= 1:
+    factor = int(factor)
+  size = (max(1, int(LOGICAL_WIDTH * factor)), max(1, int(LOGICAL_HEIGHT * factor)))
+  return ((width - size[0]) // 2, (height - size[1]) // 2), size
+
+def present_frame(dirty=None):
+  global present_layout
   window_size = display_surface.get_size()
-  if window_size == (LOGICAL_WIDTH, LOGICAL_HEIGHT):
-    display_surface.blit(screen, (0, 0))
+  if present_layout is None or present_layout[0] != window_size:
+    offset, size = compute_layout(window_size)
+    scaled = None if size == (LOGICAL_WIDTH, LOGICAL_HEIGHT) else pygame.Surface(size, 0, screen)
+    present_layout = (window_size, offset, size, scaled)
+    display_surface.fill(black)
+    dirty = None
+  window_size, offset, size, scaled = present_layout
+  if scaled is None:
+    if dirty is not None:
+      targets = [rect.move(offset) for rect in dirty]
+      for rect, target in zip(dirty, targets):
+        display_surface.blit(screen, target, rect)
+      pygame.display.update(targets)
+      return
+    display_surface.blit(screen, offset)
+  elif SCALE_FILTER == "smooth" and screen.get_bitsize() in (24, 32):
+    display_surface.blit(pygame.transform.smoothscale(screen, size, scaled), offset)
   else:
-    scaled = pygame.transform.scale(screen, window_size)
-    display_surface.blit(scaled, (0, 0))
+    display_surface.blit(pygame.transform.scale(screen, size, scaled), offset)
   pygame.display.flip()
 display_surface = init_display_surface()
 screen = pygame.Surface((LOGICAL_WIDTH, LOGICAL_HEIGHT))
+present_layout = None
 pygame.display.set_caption('Pacman')
 
 
@@ -328,220 +468,196 @@ clock = pygame.time.Clock()
 
 pygame.font.init()
 font = pygame.font.Font("freesansbold.ttf", 24)
-w = 303-16
-p_h = (7*60)+19
-m_h = (4*60)+19
-b_h = (3*60)+19
-i_w = 303-16-32
-c_w = 303+(32-16)
-
-def pick_active_js():
-  global active_js_index
-  pads = [js for js in _refresh_joysticks() if js.get_init() or js.init() is None]
-  if active_js_index is None or not any(_js_id(js) == active_js_index for js in pads):
-    active_js_index = _js_id(pads[0]) if pads else None
-  for js in pads:
-    moved = False
-    if js.get_numaxes() >= 2:
-      moved = abs(js.get_axis(0)) > JOYSTICK_DEADZONE or abs(js.get_axis(1)) > JOYSTICK_DEADZONE
-    pressed = any(js.get_button(i) for i in range(js.get_numbuttons()))
-    if moved or pressed:
-      active_js_index = _js_id(js)
-      break
-  return next((js for js in pads if _js_id(js) == active_js_index), None)
 
 def startGame():
+  maze_paths = sorted(glob.glob(os.path.join(MAZE_DIR, "*.json")))
+  levels = {}
+  level_index = 0
+
   while True:
-      js = pick_active_js()
-      all_sprites_list = pygame.sprite.RenderPlain()
-      block_list = pygame.sprite.RenderPlain()
+      # each maze is compiled (or read from its disk cache) once, then reused on every restart
+      path = maze_paths[level_index]
+      if path not in levels:
+          level = load_maze(path)
+          levels[path] = (level, render_pellet_layer(level))
+      level, pellet_layer = levels[path]
+      maze = level.graph
+      starts = level.starts
       monsta_list = pygame.sprite.RenderPlain()
-      pacman_collide = pygame.sprite.RenderPlain()
-      wall_list = setupRoomOne(all_sprites_list)
-      gate = setupGate(all_sprites_list)
-
-      p_turn = 0
-      p_steps = 0
-      b_turn = 0
-      b_steps = 0
-      i_turn = 0
-      i_steps = 0
-      c_turn = 0
-      c_steps = 0
-      Pacman = Player(w, p_h, "images/Trollman.png")
-      all_sprites_list.add(Pacman)
-      pacman_collide.add(Pacman)
-
-      Blinky = Ghost(w, b_h, "images/Blinky.png")
+
+      Pacman = Player(*starts["pacman"], "images/Trollman.png")
+
+      Blinky = Ghost(*starts["blinky"], "images/Blinky.png", "blinky", level.scatter["blinky"], 0)
       monsta_list.add(Blinky)
-      all_sprites_list.add(Blinky)
 
-      Pinky = Ghost(w, m_h, "images/Pinky.png")
+      Pinky = Ghost(*starts["pinky"], "images/Pinky.png", "pinky", level.scatter["pinky"], 0)
       monsta_list.add(Pinky)
-      all_sprites_list.add(Pinky)
 
-      Inky = Ghost(i_w, m_h, "images/Inky.png")
+      Inky = Ghost(*starts["inky"], "images/Inky.png", "inky", level.scatter["inky"], 3)
       monsta_list.add(Inky)
-      all_sprites_list.add(Inky)
 
-      Clyde = Ghost(c_w, m_h, "images/Clyde.png")
+      Clyde = Ghost(*starts["clyde"], "images/Clyde.png", "clyde", level.scatter["clyde"], 6)
       monsta_list.add(Clyde)
-      all_sprites_list.add(Clyde)
-      for row in range(19):
-          for column in range(19):
-              if (row == 7 or row == 8) and (column == 8 or column == 9 or column == 10):
-                  continue
-
-              block = Block(yellow, 4, 4)
-              block.rect.x = (30 * column + 6) + 26
-              block.rect.y = (30 * row + 6) + 26
-
-              b_collide = pygame.sprite.spritecollide(block, wall_list, False)
-              p_collide = pygame.sprite.spritecollide(block, pacman_collide, False)
-              if b_collide or p_collide:
-                  continue
-              block_list.add(block)
-              all_sprites_list.add(block)
-
-      bll = len(block_list)
+      ghosts = (Blinky, Pinky, Inky, Clyde)
+      pellets = bytearray(level.pellet_mask)
+      bll = level.pellet_total
+      # remaining pellets live in the background; eaten ones are erased from it
+      background = pellet_layer.copy()
+      screen.blit(background, (0, 0))
+      actors = (Pacman,) + ghosts
+      erase_rects = []
+      dirty = [screen.get_rect()]
+      shown_score = None
       score = 0
       done = False
+      frame = 0
+      mode_frame = 0
+      frightened_frames = 0
+      heading = (0, -1)
+      held = []
+      accumulator = 0.0
+      outcome = None
+      clock.tick()
 
       while not done:
-          # allow any controller to claim active before handling events
-          js = pick_active_js()
-
-      for event in pygame.event.get():
+          for event in pygame.event.get():
               if event.type == pygame.QUIT:
                   return
+              if joypad.handle_event(event):
+                  continue
 
               if event.type == pygame.KEYDOWN:
                   if event.key in (pygame.K_ESCAPE, pygame.K_v, pygame.K_e):
                       return
-                  if event.key == pygame.K_LEFT:
-                      Pacman.changespeed(-30,0)
-                  if event.key == pygame.K_RIGHT:
-                      Pacman.changespeed(30,0)
-                  if event.key == pygame.K_UP:
-                      Pacman.changespeed(0,-30)
-                  if event.key == pygame.K_DOWN:
-                      Pacman.changespeed(0,30)
+                  if event.key in ARROW_KEYS:
+                      held.append(ARROW_KEYS[event.key])
+                      Pacman.wanted = ARROW_KEYS[event.key]
 
               if event.type == pygame.KEYUP:
-                  if event.key == pygame.K_LEFT:
-                      Pacman.changespeed(30,0)
-                  if event.key == pygame.K_RIGHT:
-                      Pacman.changespeed(-30,0)
-                  if event.key == pygame.K_UP:
-                      Pacman.changespeed(0,30)
-                  if event.key == pygame.K_DOWN:
-                      Pacman.changespeed(0,-30)
-
-          # joystick override (when axis moves)
-          if js:
-              axis_x = js.get_axis(0) if js.get_numaxes() > 0 else 0
-              axis_y = js.get_axis(1) if js.get_numaxes() > 1 else 0
-              if abs(axis_x) > JOYSTICK_DEADZONE or abs(axis_y) > JOYSTICK_DEADZONE:
-                  Pacman.change_x = 0
-                  Pacman.change_y = 0
-                  if abs(axis_x) > abs(axis_y):
-                      Pacman.change_x = -JOYSTICK_SPEED if axis_x < 0 else JOYSTICK_SPEED
-                  else:
-                      Pacman.change_y = -JOYSTICK_SPEED if axis_y < 0 else JOYSTICK_SPEED
+                  if event.key in ARROW_KEYS and ARROW_KEYS[event.key] in held:
+                      held.remove(ARROW_KEYS[event.key])
+
+          # joystick override (when stick or hat is pushed)
+          joy = joypad.direction()
+          if joy in DIRECTIONS:
+              Pacman.wanted = DIRECTIONS.index(joy)
+          elif CLASSIC_MODE:
+              Pacman.wanted = held[-1] if held else None
 
           # immediate quit if key held (failsafe)
           pressed = pygame.key.get_pressed()
           if pressed[pygame.K_ESCAPE] or pressed[pygame.K_v] or pressed[pygame.K_e]:
               return
-          Pacman.update(wall_list,gate)
-
-          returned = Pinky.changespeed(Pinky_directions,False,p_turn,p_steps,pl)
-          p_turn = returned[0]
-          p_steps = returned[1]
-          Pinky.changespeed(Pinky_directions,False,p_turn,p_steps,pl)
-          Pinky.update(wall_list,False)
-
-          returned = Blinky.changespeed(Blinky_directions,False,b_turn,b_steps,bl)
-          b_turn = returned[0]
-          b_steps = returned[1]
-          Blinky.changespeed(Blinky_directions,False,b_turn,b_steps,bl)
-          Blinky.update(wall_list,False)
-
-          returned = Inky.changespeed(Inky_directions,False,i_turn,i_steps,il)
-          i_turn = returned[0]
-          i_steps = returned[1]
-          Inky.changespeed(Inky_directions,False,i_turn,i_steps,il)
-          Inky.update(wall_list,False)
-
-          returned = Clyde.changespeed(Clyde_directions,"clyde",c_turn,c_steps,cl)
-          c_turn = returned[0]
-          c_steps = returned[1]
-          Clyde.changespeed(Clyde_directions,"clyde",c_turn,c_steps,cl)
-          Clyde.update(wall_list,False)
-          blocks_hit_list = pygame.sprite.spritecollide(Pacman, block_list, True)
-          if len(blocks_hit_list) > 0:
-              score += len(blocks_hit_list)
-          screen.fill(black)
-
-          wall_list.draw(screen)
-          gate.draw(screen)
-          all_sprites_list.draw(screen)
-          monsta_list.draw(screen)
-
-          text=font.render("Score: "+str(score)+"/"+str(bll), True, red)
-          screen.blit(text, [10, 10])
-
-          if score == bll:
+
+          # fixed-timestep simulation, decoupled from the render rate
+          accumulator = min(accumulator + clock.tick(RENDER_FPS) / 1000.0, MAX_FRAME_TIME)
+          while accumulator >= 1.0 / TICK_RATE and outcome is None:
+              accumulator -= 1.0 / TICK_RATE
+              Pacman.advance(maze)
+
+              if Pacman.direction is not None:
+                  heading = DIRECTIONS[Pacman.direction]
+              pacman_tile = maze.target(*nearest_tile(Pacman.rect))
+              blinky_tile = nearest_tile(Blinky.rect)
+              mode = scheduled_mode(mode_frame)
+              for ghost in ghosts:
+                  if mode == "scatter":
+                      target = ghost.corner
+                  else:
+                      target = chase_target(ghost, maze, pacman_tile, heading, blinky_tile)
+                  ghost.steer(maze, target, frame)
+              frame += 1
+              if frightened_frames:
+                  frightened_frames -= 1
+                  if not frightened_frames:
+                      for ghost in ghosts:
+                          ghost.set_frightened(False)
+              else:
+                  mode_frame += 1
+
+              eaten = eat_pellets(pellets, Pacman.rect)
+              if eaten:
+                  score += len(eaten)
+                  for col, row, kind in eaten:
+                      background.fill(black, pellet_rect(col, row, kind))
+                  if any(kind == POWER_PELLET for col, row, kind in eaten):
+                      frightened_frames = FRIGHTENED_SECONDS * TICK_RATE
+                      for ghost in ghosts:
+                          ghost.set_frightened(True)
+              if score == bll:
+                  outcome = "won"
+
+              for ghost in pygame.sprite.spritecollide(Pacman, monsta_list, False):
+                  if ghost.frightened:
+                      ghost.send_home()
+                  else:
+                      outcome = "caught"
+
+          alpha = 1.0 if CLASSIC_MODE else accumulator * TICK_RATE
+          for rect in erase_rects:
+              screen.blit(background, rect, rect)
+          drawn = [screen.blit(sprite.image, sprite.draw_pos(alpha)) for sprite in actors]
+
+          if score != shown_score:
+              text=font.render("Score: "+str(score)+"/"+str(bll), True, red)
+              shown_score = score
+          drawn.append(screen.blit(text, [10, 10]))
+          dirty.extend(erase_rects)
+          dirty.extend(drawn)
+          erase_rects = drawn
+
+          if outcome == "won":
             if doNext("Congratulations, you won!", 145):
+              level_index = (level_index + 1) % len(maze_paths)
               done = True
               break
             return
 
-          monsta_hit_list = pygame.sprite.spritecollide(Pacman, monsta_list, False)
-
-          if monsta_hit_list:
+          if outcome == "caught":
             if doNext("Game Over", 235):
               done = True
               break
             return
 
-          present_frame()
-          clock.tick(10)
+          present_frame(dirty)
+          dirty = []
 
 def doNext(message, left):
+  global next_overlay
+  if next_overlay is None:
+    next_overlay = pygame.Surface((400,200))
+    next_overlay.set_alpha(10)
+    next_overlay.fill((128,128,128))
+  text1=font.render(message, True, white)
+  text2=font.render("To play again, press ENTER.", True, white)
+  text3=font.render("To quit, press ESCAPE.", True, white)
   while True:
       for event in pygame.event.get():
         if event.type == pygame.QUIT:
           return False
+        joypad.handle_event(event)
         if event.type == pygame.KEYDOWN:
           if event.key in (pygame.K_ESCAPE, pygame.K_v, pygame.K_e):
             return False
           if event.key == pygame.K_RETURN:
             return True
       # joystick buttons: A/Start continue, B/Back esc
-      js = pick_active_js()
-      if js:
-        if js.get_button(0) or js.get_button(9):
-          return True
+      if joypad.button_held((0, 9)):
+        return True
       pressed = pygame.key.get_pressed()
       if pressed[pygame.K_ESCAPE] or pressed[pygame.K_v] or pressed[pygame.K_e]:
         return False
-      w = pygame.Surface((400,200))
-      w.set_alpha(10)
-      w.fill((128,128,128))
-      screen.blit(w, (100,200))
-      text1=font.render(message, True, white)
+      # the translucent overlay is re-blitted every frame so the maze fades out
+      screen.blit(next_overlay, (100,200))
       screen.blit(text1, [left, 233])
-
-      text2=font.render("To play again, press ENTER.", True, white)
       screen.blit(text2, [135, 303])
-      text3=font.render("To quit, press ESCAPE.", True, white)
       screen.blit(text3, [165, 333])
 
       present_frame()
 
       clock.tick(10)
 
+next_overlay = None
 startGame()
 
 pygame.quit()
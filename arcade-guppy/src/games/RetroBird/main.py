@@ -1,9 +1,14 @@
 import os
 import random
+import sys
 
 import pygame
 
-from objects import Base, DISPLAY_HEIGHT, Grumpy, Pipe, WORLD_HEIGHT, WORLD_WIDTH
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from arcade_audio import SoundBank
+from arcade_input import JoystickManager
+from arcade_scores import Leaderboard
+from objects import Base, DISPLAY_HEIGHT, Grumpy, Pipe, WORLD_HEIGHT, WORLD_WIDTH, pipe_art
 
 ACTION_KEYS = {
 	pygame.K_RETURN,
@@ -55,21 +60,11 @@ def parse_window_size(raw_value):
 		return None
 
 
-def load_joysticks():
-	connected = []
-	for index in range(pygame.joystick.get_count()):
-		joystick = pygame.joystick.Joystick(index)
-		if not joystick.get_init():
-			joystick.init()
-		connected.append(joystick)
-	return connected
-
-
 def is_key_pressed(keys, key):
 	return 0 <= key < len(keys) and bool(keys[key])
 
 
-def is_action_down(joysticks):
+def is_action_down(joypad):
 	keys = pygame.key.get_pressed()
 	for key in ACTION_KEYS:
 		if is_key_pressed(keys, key):
@@ -78,13 +73,7 @@ def is_action_down(joysticks):
 	if pygame.mouse.get_pressed()[0]:
 		return True
 
-	for joystick in joysticks:
-		button_count = joystick.get_numbuttons()
-		for button in ACTION_JOYSTICK_BUTTONS:
-			if button < button_count and joystick.get_button(button):
-				return True
-
-	return False
+	return joypad.button_held(ACTION_JOYSTICK_BUTTONS)
 
 
 def make_font(size, bold=True):
@@ -106,32 +95,53 @@ def draw_retro_background(surface):
 		pygame.draw.line(surface, (0, 100, 150), (x, 0), (x, WORLD_HEIGHT), 1)
 
 
-def draw_retro_title(surface):
-	title_text = 'RETRO'
-	subtitle_text = 'BIRD'
-	title_x = WORLD_WIDTH // 2 - 58
-	subtitle_x = WORLD_WIDTH // 2 - 50
-
-	for offset in range(4, 0, -1):
-		title_shadow = TITLE_FONT.render(title_text, True, NEON_BLUE)
-		surface.blit(title_shadow, (title_x + offset, 56 + offset))
-
-	title = TITLE_FONT.render(title_text, True, NEON_YELLOW)
-	surface.blit(title, (title_x, 56))
+class GlowText:
+	"""Text drawn over a stack of offset glow copies, re-rendered only when the text changes.
+
+	The glow copies and the text are composited once with premultiplied alpha,
+	so the antialiased edges come out as if each layer were blitted in turn and
+	every frame after that is a single blit.
+	"""
+
+	def __init__(self, font, color, glow_color=None, depth=0):
+		self.font = font
+		self.color = color
+		self.glow_color = glow_color
+		self.depth = depth if glow_color else 0
+		self.text = None
+		self.image = None
+		self.size = (0, 0)
+
+	def render(self, text):
+		if text != self.text:
+			# convert_alpha first: premul_alpha misreads the padded rows font.render can return
+			face = self.font.render(text, True, self.color).convert_alpha().premul_alpha()
+			self.size = face.get_size()
+			self.image = pygame.Surface((self.size[0] + self.depth, self.size[1] + self.depth), pygame.SRCALPHA)
+			if self.depth:
+				glow = self.font.render(text, True, self.glow_color).convert_alpha().premul_alpha()
+				for offset in range(self.depth, 0, -1):
+					self.image.blit(glow, (offset, offset), special_flags=pygame.BLEND_PREMULTIPLIED)
+			self.image.blit(face, (0, 0), special_flags=pygame.BLEND_PREMULTIPLIED)
+			self.text = text
+		return self.image
+
+	def draw(self, surface, text, **anchor):
+		"""Blit text positioned like font.render(text).get_rect(**anchor), glow trailing down-right"""
+		image = self.render(text)
+		rect = pygame.Rect((0, 0), self.size)
+		for name, value in anchor.items():
+			setattr(rect, name, value)
+		surface.blit(image, rect.topleft, special_flags=pygame.BLEND_PREMULTIPLIED)
 
-	for offset in range(4, 0, -1):
-		sub_shadow = TITLE_FONT.render(subtitle_text, True, NEON_PINK)
-		surface.blit(sub_shadow, (subtitle_x + offset, 106 + offset))
 
-	subtitle = TITLE_FONT.render(subtitle_text, True, NEON_GREEN)
-	surface.blit(subtitle, (subtitle_x, 106))
-
-	help_text = ARCADE_FONT.render('ONE BUTTON TO FLAP', True, WHITE)
-	surface.blit(help_text, help_text.get_rect(center=(WORLD_WIDTH // 2, 332)))
+def draw_retro_title(surface):
+	title_text.draw(surface, 'RETRO', topleft=(WORLD_WIDTH // 2 - 58, 56))
+	subtitle_text.draw(surface, 'BIRD', topleft=(WORLD_WIDTH // 2 - 50, 106))
+	help_text.draw(surface, 'ONE BUTTON TO FLAP', center=(WORLD_WIDTH // 2, 332))
 
 	if pygame.time.get_ticks() % 1000 < 550:
-		start_text = ARCADE_FONT.render('PRESS BUTTON TO START', True, WHITE)
-		surface.blit(start_text, start_text.get_rect(center=(WORLD_WIDTH // 2, 372)))
+		prompt_text.draw(surface, 'PRESS BUTTON TO START', center=(WORLD_WIDTH // 2, 372))
 
 
 def draw_retro_gameover(surface, score):
@@ -140,26 +150,15 @@ def draw_retro_gameover(surface, score):
 	pygame.draw.rect(surface, RED, box_rect, 4)
 	pygame.draw.rect(surface, RED, box_rect.inflate(-6, -6), 2)
 
-	gameover_text = TITLE_FONT.render('GAME OVER', True, RED)
-	surface.blit(gameover_text, gameover_text.get_rect(center=(WORLD_WIDTH // 2, 186)))
-
-	score_text = ARCADE_FONT.render(f'SCORE: {score}', True, NEON_YELLOW)
-	surface.blit(score_text, score_text.get_rect(center=(WORLD_WIDTH // 2, 236)))
+	gameover_text.draw(surface, 'GAME OVER', center=(WORLD_WIDTH // 2, 186))
+	result_text.draw(surface, f'SCORE: {score}  BEST: {leaderboard.best()}', center=(WORLD_WIDTH // 2, 236))
 
 	if pygame.time.get_ticks() % 800 < 450:
-		restart_text = ARCADE_FONT.render('PRESS BUTTON FOR MENU', True, WHITE)
-		surface.blit(restart_text, restart_text.get_rect(center=(WORLD_WIDTH // 2, 278)))
+		prompt_text.draw(surface, 'PRESS BUTTON FOR MENU', center=(WORLD_WIDTH // 2, 278))
 
 
 def draw_retro_score(surface, score):
-	score_text = SCORE_FONT.render(str(score), True, NEON_YELLOW)
-	text_rect = score_text.get_rect(center=(WORLD_WIDTH // 2, 58))
-	for offset in range(3, 0, -1):
-		glow = SCORE_FONT.render(str(score), True, ARCADE_ORANGE)
-		glow_rect = glow.get_rect(center=(WORLD_WIDTH // 2 + offset, 58 + offset))
-		surface.blit(glow, glow_rect)
-
-	surface.blit(score_text, text_rect)
+	score_text.draw(surface, str(score), center=(WORLD_WIDTH // 2, 58))
 	pygame.draw.line(surface, NEON_YELLOW, (0, 96), (WORLD_WIDTH, 96), 2)
 
 
@@ -190,6 +189,39 @@ def update_particles(surface):
 		pygame.draw.circle(surface, particle['color'], (int(particle['x']), int(particle['y'])), size)
 
 
+def compute_layout(window_size):
+	# integer keeps every world pixel an equal square block; fit uses as much of the window as it can
+	width, height = window_size
+	factor = min(width / WORLD_WIDTH, height / WORLD_HEIGHT)
+	if SCALE_MODE == 'integer' and factor >= 1:
+		factor = int(factor)
+	size = (max(1, int(WORLD_WIDTH * factor)), max(1, int(WORLD_HEIGHT * factor)))
+	return pygame.Rect(((width - size[0]) // 2, (height - size[1]) // 2), size)
+
+
+def present_frame():
+	global present_layout
+
+	window_size = window.get_size()
+	full_update = present_layout is None or present_layout[0] != window_size
+	if full_update:
+		frame_rect = compute_layout(window_size)
+		target = None if frame_rect.size == game_surface.get_size() else window.subsurface(frame_rect)
+		present_layout = (window_size, frame_rect, target)
+		window.fill(BLACK)
+
+	window_size, frame_rect, target = present_layout
+	if target is None:
+		window.blit(game_surface, frame_rect)
+	else:
+		pygame.transform.scale(game_surface, frame_rect.size, target)
+
+	if full_update:
+		pygame.display.flip()
+	else:
+		pygame.display.update(frame_rect)
+
+
 def render_frame():
 	game_surface.blit(bg_surface, (0, 0))
 
@@ -211,11 +243,7 @@ def render_frame():
 		draw_retro_gameover(game_surface, score)
 
 	update_particles(game_surface)
-
-	window.fill(BLACK)
-	frame = pygame.transform.scale(game_surface, scaled_size)
-	window.blit(frame, render_offset)
-	pygame.display.update()
+	present_frame()
 
 
 def spawn_pipe_pair():
@@ -234,6 +262,7 @@ def update_scoring():
 		if grumpy.rect.left > pipe.rect.right:
 			pipe.scored = True
 			score += 1
+			sounds.play('point')
 			create_particles(WORLD_WIDTH // 2, 58, NEON_YELLOW)
 		break
 
@@ -249,6 +278,7 @@ def start_round():
 	particles.clear()
 	current_pipe_color = random.choice(pipe_colors)
 	base = Base(game_surface, current_pipe_color)
+	pipe_art(current_pipe_color)
 	grumpy = Grumpy(game_surface)
 	action_requires_release = True
 
@@ -260,6 +290,8 @@ def trigger_game_over():
 		return
 
 	game_state = STATE_GAME_OVER
+	leaderboard.submit(score)
+	sounds.play('hit')
 	if grumpy.alive:
 		create_particles(grumpy.rect.centerx, grumpy.rect.centery, RED)
 	grumpy.alive = False
@@ -283,15 +315,15 @@ def handle_action_press():
 
 	if game_state == STATE_PLAYING:
 		grumpy.flap()
+		sounds.play('wing')
 
 
 pygame.init()
-pygame.joystick.init()
 
 SCREEN = parse_window_size(os.environ.get('ARCADE_WINDOW_SIZE')) or (WORLD_WIDTH, WORLD_HEIGHT)
-WINDOW_WIDTH, WINDOW_HEIGHT = SCREEN
 
 embedded_mode = os.environ.get('ARCADE_EMBEDDED') == '1'
+SCALE_MODE = os.environ.get('RETROBIRD_SCALE', 'fit').strip().lower()
 window_pos = os.environ.get('ARCADE_WINDOW_POS')
 if window_pos:
 	os.environ['SDL_VIDEO_WINDOW_POS'] = window_pos
@@ -305,20 +337,20 @@ game_surface = pygame.Surface((WORLD_WIDTH, WORLD_HEIGHT)).convert()
 clock = pygame.time.Clock()
 FPS = 60
 
-scale = min(WINDOW_WIDTH / WORLD_WIDTH, WINDOW_HEIGHT / WORLD_HEIGHT)
-scaled_size = (
-	max(1, int(WORLD_WIDTH * scale)),
-	max(1, int(WORLD_HEIGHT * scale)),
-)
-render_offset = (
-	(WINDOW_WIDTH - scaled_size[0]) // 2,
-	(WINDOW_HEIGHT - scaled_size[1]) // 2,
-)
+present_layout = None
 
 ARCADE_FONT = make_font(18)
 TITLE_FONT = make_font(34)
 SCORE_FONT = make_font(54)
 
+title_text = GlowText(TITLE_FONT, NEON_YELLOW, NEON_BLUE, 4)
+subtitle_text = GlowText(TITLE_FONT, NEON_GREEN, NEON_PINK, 4)
+score_text = GlowText(SCORE_FONT, NEON_YELLOW, ARCADE_ORANGE, 3)
+gameover_text = GlowText(TITLE_FONT, RED)
+result_text = GlowText(ARCADE_FONT, NEON_YELLOW)
+help_text = GlowText(ARCADE_FONT, WHITE)
+prompt_text = GlowText(ARCADE_FONT, WHITE)
+
 STAR_FIELD = [
 	(
 		random.randint(0, WORLD_WIDTH),
@@ -341,8 +373,13 @@ particles = []
 
 game_state = STATE_TITLE
 score = 0
+leaderboard = Leaderboard('retro-bird')
+sounds = SoundBank()
+sounds.load('wing', 'Sounds/wing.wav', max_voices=1)
+sounds.load('point', 'Sounds/point.wav')
+sounds.load('hit', 'Sounds/hit.wav', category='event')
 last_pipe = 0
-joysticks = load_joysticks()
+joypad = JoystickManager()
 action_was_down = False
 action_requires_release = True
 running = True
@@ -351,12 +388,12 @@ while running:
 	for event in pygame.event.get():
 		if event.type == pygame.QUIT:
 			running = False
-		elif event.type in (pygame.JOYDEVICEADDED, pygame.JOYDEVICEREMOVED):
-			joysticks = load_joysticks()
+		elif joypad.handle_event(event):
+			continue
 		elif event.type == pygame.KEYDOWN and event.key in (pygame.K_ESCAPE, pygame.K_q):
 			running = False
 
-	action_down = is_action_down(joysticks)
+	action_down = is_action_down(joypad)
 	if not action_down:
 		action_requires_release = False
 	if action_down and not action_was_down and not action_requires_release:
@@ -9,6 +9,7 @@ BIRD_WIDTH = 34
 BIRD_HEIGHT = 24
 BIRD_X = 64
 BIRD_RADIUS = 14
+BIRD_MARGIN = 2
 
 PIPE_WIDTH = 52
 PIPE_GAP = 116
@@ -25,18 +26,44 @@ NEON_PINK = (255, 0, 255)
 NEON_YELLOW = (255, 255, 0)
 BLACK = (0, 0, 0)
 WHITE = (255, 255, 255)
+COLOR_KEY = (1, 2, 3)
 
+PIPE_TAIL_HEIGHT = 7
+PIPE_LINE_SPACING = 15
 
-class Grumpy:
-	def __init__(self, surface):
-		self.surface = surface
-		self.bird_colors = [NEON_GREEN, NEON_PINK, NEON_YELLOW, NEON_BLUE]
-		self.color = random.choice(self.bird_colors)
-		self.reset()
+_bird_frames = {}
+_pipe_art = {}
+_base_strips = {}
 
-	def draw_bird(self):
-		body_rect = pygame.Rect(self.rect.x, self.rect.y, self.rect.width, self.rect.height)
-		wing_offset = -1 if self.vel < -1 else 2 if self.vel > 3 else 0
+
+def draw_pipe(surface, rect, color):
+	pygame.draw.rect(surface, color, rect)
+	pygame.draw.rect(surface, BLACK, rect, 3)
+	inner_rect = rect.inflate(-10, -10)
+	if inner_rect.width > 0 and inner_rect.height > 0:
+		pygame.draw.rect(surface, BLACK, inner_rect, 2)
+
+	for y in range(rect.top, rect.bottom, PIPE_LINE_SPACING):
+		pygame.draw.line(surface, BLACK, (rect.left, y), (rect.right, y), 1)
+
+
+def keyed_surface(width, height):
+	surface = pygame.Surface((width, height)).convert()
+	surface.fill(COLOR_KEY)
+	surface.set_colorkey(COLOR_KEY, pygame.RLEACCEL)
+	return surface
+
+
+def bird_frames(color):
+	"""Cached bird images for one colour, one per wing position (up, level, down)"""
+	frames = _bird_frames.get(color)
+	if frames is not None:
+		return frames
+
+	frames = []
+	for wing_offset in (-1, 0, 2):
+		frame = keyed_surface(BIRD_WIDTH + 9 + BIRD_MARGIN * 2, BIRD_HEIGHT + BIRD_MARGIN * 2)
+		body_rect = pygame.Rect(BIRD_MARGIN, BIRD_MARGIN, BIRD_WIDTH, BIRD_HEIGHT)
 		wing_rect = pygame.Rect(body_rect.x + 7, body_rect.y + 8 + wing_offset, 12, 8)
 		beak_points = [
 			(body_rect.right - 2, body_rect.centery),
@@ -44,14 +71,81 @@ class Grumpy:
 			(body_rect.right + 9, body_rect.centery + 3),
 		]
 
-		pygame.draw.ellipse(self.surface, self.color, body_rect)
-		pygame.draw.ellipse(self.surface, BLACK, body_rect, 2)
-		pygame.draw.ellipse(self.surface, NEON_YELLOW, wing_rect)
-		pygame.draw.ellipse(self.surface, BLACK, wing_rect, 2)
-		pygame.draw.polygon(self.surface, NEON_YELLOW, beak_points)
-		pygame.draw.polygon(self.surface, BLACK, beak_points, 2)
-		pygame.draw.circle(self.surface, WHITE, (body_rect.x + 22, body_rect.y + 7), 4)
-		pygame.draw.circle(self.surface, BLACK, (body_rect.x + 23, body_rect.y + 7), 2)
+		pygame.draw.ellipse(frame, color, body_rect)
+		pygame.draw.ellipse(frame, BLACK, body_rect, 2)
+		pygame.draw.ellipse(frame, NEON_YELLOW, wing_rect)
+		pygame.draw.ellipse(frame, BLACK, wing_rect, 2)
+		pygame.draw.polygon(frame, NEON_YELLOW, beak_points)
+		pygame.draw.polygon(frame, BLACK, beak_points, 2)
+		pygame.draw.circle(frame, WHITE, (body_rect.x + 22, body_rect.y + 7), 4)
+		pygame.draw.circle(frame, BLACK, (body_rect.x + 23, body_rect.y + 7), 2)
+		frames.append(frame)
+
+	_bird_frames[color] = frames
+	return frames
+
+
+def pipe_art(color):
+	"""Cached (body, tails, cap) surfaces for pipes of one colour.
+
+	The body is one full-height pipe whose top end and line pattern match
+	every pipe, so a pipe of any height is a slice of it. Only the bottom
+	end depends on the height, and only through height % 15, so there is
+	one tail per phase. Each pipe's cap hides its other end.
+	"""
+	art = _pipe_art.get(color)
+	if art is not None:
+		return art
+
+	body = keyed_surface(PIPE_WIDTH + 1, DISPLAY_HEIGHT)
+	draw_pipe(body, pygame.Rect(0, 0, PIPE_WIDTH, DISPLAY_HEIGHT), color)
+
+	tails = []
+	for phase in range(PIPE_LINE_SPACING):
+		height = PIPE_LINE_SPACING * 3 + phase
+		sample = keyed_surface(PIPE_WIDTH + 1, height)
+		draw_pipe(sample, pygame.Rect(0, 0, PIPE_WIDTH, height), color)
+		tail = sample.subsurface((0, height - PIPE_TAIL_HEIGHT, PIPE_WIDTH + 1, PIPE_TAIL_HEIGHT)).copy()
+		tail.set_colorkey(COLOR_KEY, pygame.RLEACCEL)
+		tails.append(tail)
+
+	cap = pygame.Surface((PIPE_WIDTH + 6, PIPE_CAP_HEIGHT)).convert()
+	cap.fill(color)
+	pygame.draw.rect(cap, BLACK, cap.get_rect(), 3)
+
+	art = _pipe_art[color] = (body, tails, cap)
+	return art
+
+
+def base_strip(color):
+	"""Cached image of one base segment, starting one row above the base"""
+	strip = _base_strips.get(color)
+	if strip is not None:
+		return strip
+
+	top = 1
+	height = WORLD_HEIGHT - DISPLAY_HEIGHT
+	strip = keyed_surface(WORLD_WIDTH + 1, height + top)
+	strip.fill(color, (0, top, WORLD_WIDTH, height))
+	pygame.draw.line(strip, WHITE, (0, top), (WORLD_WIDTH, top), 3)
+	for x in range(0, WORLD_WIDTH, 20):
+		pygame.draw.line(strip, BLACK, (x, top), (x, top + height), 1)
+
+	_base_strips[color] = strip
+	return strip
+
+
+class Grumpy:
+	def __init__(self, surface):
+		self.surface = surface
+		self.bird_colors = [NEON_GREEN, NEON_PINK, NEON_YELLOW, NEON_BLUE]
+		self.color = random.choice(self.bird_colors)
+		self.frames = bird_frames(self.color)
+		self.reset()
+
+	def draw_bird(self):
+		wing_state = 0 if self.vel < -1 else 2 if self.vel > 3 else 1
+		self.surface.blit(self.frames[wing_state], (self.rect.x - BIRD_MARGIN, self.rect.y - BIRD_MARGIN))
 
 	def update(self):
 		self.vel = min(MAX_FALL_SPEED, self.vel + GRAVITY)
@@ -89,6 +183,7 @@ class Base:
 		self.x1 = 0.0
 		self.x2 = float(WORLD_WIDTH)
 		self.y = DISPLAY_HEIGHT
+		self.strip = base_strip(color)
 
 	def update(self, speed):
 		self.x1 -= speed
@@ -99,12 +194,8 @@ class Base:
 		if self.x2 <= -WORLD_WIDTH:
 			self.x2 = self.x1 + WORLD_WIDTH
 
-		height = WORLD_HEIGHT - self.y
 		for x_offset in (int(round(self.x1)), int(round(self.x2))):
-			pygame.draw.rect(self.surface, self.color, (x_offset, self.y, WORLD_WIDTH, height))
-			pygame.draw.line(self.surface, WHITE, (x_offset, self.y), (x_offset + WORLD_WIDTH, self.y), 3)
-			for x in range(x_offset, x_offset + WORLD_WIDTH, 20):
-				pygame.draw.line(self.surface, BLACK, (x, self.y), (x, WORLD_HEIGHT), 1)
+			self.surface.blit(self.strip, (x_offset, self.y - 1))
 
 
 class Pipe(pygame.sprite.Sprite):
@@ -116,6 +207,7 @@ class Pipe(pygame.sprite.Sprite):
 		self.is_top = position == 1
 		self.scored = False
 		self.x = float(PIPE_SPAWN_X)
+		self.body, tails, self.cap = pipe_art(color)
 		gap_half = PIPE_GAP // 2
 
 		if self.is_top:
@@ -124,6 +216,7 @@ class Pipe(pygame.sprite.Sprite):
 		else:
 			top = min(DISPLAY_HEIGHT - 56, gap_center + gap_half)
 			self.rect = pygame.Rect(int(self.x), top, PIPE_WIDTH, DISPLAY_HEIGHT - top)
+			self.tail = tails[self.rect.height % PIPE_LINE_SPACING]
 
 	def update(self, speed):
 		self.x -= speed
@@ -132,19 +225,13 @@ class Pipe(pygame.sprite.Sprite):
 			self.kill()
 			return
 
-		pygame.draw.rect(self.surface, self.color, self.rect)
-		pygame.draw.rect(self.surface, BLACK, self.rect, 3)
-		inner_rect = self.rect.inflate(-10, -10)
-		if inner_rect.width > 0 and inner_rect.height > 0:
-			pygame.draw.rect(self.surface, BLACK, inner_rect, 2)
-
-		for y in range(self.rect.top, self.rect.bottom, 15):
-			pygame.draw.line(self.surface, BLACK, (self.rect.left, y), (self.rect.right, y), 1)
-
+		x, top = self.rect.topleft
+		height = self.rect.height
 		if self.is_top:
-			cap_rect = pygame.Rect(self.rect.x - 3, self.rect.bottom - PIPE_CAP_HEIGHT, self.rect.width + 6, PIPE_CAP_HEIGHT)
+			self.surface.blit(self.body, (x, top), (0, 0, PIPE_WIDTH + 1, height - PIPE_CAP_HEIGHT))
+			self.surface.blit(self.cap, (x - 3, self.rect.bottom - PIPE_CAP_HEIGHT))
 		else:
-			cap_rect = pygame.Rect(self.rect.x - 3, self.rect.top, self.rect.width + 6, PIPE_CAP_HEIGHT)
-
-		pygame.draw.rect(self.surface, self.color, cap_rect)
-		pygame.draw.rect(self.surface, BLACK, cap_rect, 3)
+			self.surface.blit(self.cap, (x - 3, top))
+			body_height = height - PIPE_CAP_HEIGHT - PIPE_TAIL_HEIGHT
+			self.surface.blit(self.body, (x, top + PIPE_CAP_HEIGHT), (0, PIPE_CAP_HEIGHT, PIPE_WIDTH + 1, body_height))
+			self.surface.blit(self.tail, (x, self.rect.bottom - PIPE_TAIL_HEIGHT))
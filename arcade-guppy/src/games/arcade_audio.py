@@ -0,0 +1,99 @@
+"""Preloaded sound effects shared by the cabinet games, on reserved per-category channels with per-effect voice limits"""
+import hashlib
+import os
+
+import pygame
+
+DEFAULT_CATEGORIES = {"ui": 1, "sfx": 3, "event": 1}
+DEFAULT_MAX_VOICES = 2
+SPARE_CHANNELS = 4
+
+
+def resolve_cache_dir():
+    explicit_path = os.environ.get("ARCADE_AUDIO_CACHE", "").strip()
+    if explicit_path:
+        return os.path.abspath(explicit_path)
+    return os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "data", "audio-cache"))
+
+
+def init_mixer():
+    if pygame.mixer.get_init() is None:
+        try:
+            pygame.mixer.init()
+        except pygame.error as error:
+            print(f"[AUDIO] Sound disabled: {error}")
+            return None
+    return pygame.mixer.get_init()
+
+
+class SoundBank:
+    def __init__(self, categories=None, cache_dir=None):
+        self.format = init_mixer()
+        self.cache_dir = cache_dir or resolve_cache_dir()
+        self.sounds = {}
+        self.channels = {}
+        self._voices = {}
+        self._order = 0
+        if self.format is None:
+            return
+
+        categories = categories or DEFAULT_CATEGORIES
+        reserved = sum(categories.values())
+        pygame.mixer.set_num_channels(max(pygame.mixer.get_num_channels(), reserved + SPARE_CHANNELS))
+        pygame.mixer.set_reserved(reserved)
+        index = 0
+        for category, count in categories.items():
+            self.channels[category] = list(range(index, index + count))
+            index += count
+
+    def load(self, name, path, category="sfx", volume=1.0, max_voices=DEFAULT_MAX_VOICES):
+        if self.format is None:
+            return
+        if category not in self.channels:
+            raise ValueError(f"unknown sound category {category!r}")
+        try:
+            sound = self._decode(path)
+        except (OSError, pygame.error) as error:
+            print(f"[AUDIO] Could not load {path}: {error}")
+            return
+        sound.set_volume(volume)
+        self.sounds[name] = (sound, category, max_voices)
+
+    def play(self, name):
+        entry = self.sounds.get(name)
+        if entry is None:
+            return
+        sound, category, max_voices = entry
+        pool = self.channels[category]
+        busy = [index for index in pool if pygame.mixer.Channel(index).get_busy()]
+        voices = [index for index in busy if self._voices.get(index, (None,))[0] == name]
+        if len(voices) >= max_voices:
+            index = min(voices, key=lambda i: self._voices[i][1])
+        elif len(busy) < len(pool):
+            index = next(index for index in pool if index not in busy)
+        else:
+            index = min(pool, key=lambda i: self._voices.get(i, (None, 0))[1])
+        self._order += 1
+        self._voices[index] = (name, self._order)
+        pygame.mixer.Channel(index).play(sound)
+
+    def _decode(self, path):
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        key = hashlib.sha1(f"{path}|{stat.st_size}|{stat.st_mtime_ns}|{self.format}".encode("utf-8")).hexdigest()
+        cache_path = os.path.join(self.cache_dir, key + ".pcm")
+        try:
+            with open(cache_path, "rb") as handle:
+                return pygame.mixer.Sound(buffer=handle.read())
+        except OSError:
+            pass
+
+        sound = pygame.mixer.Sound(path)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(cache_path + ".tmp", "wb") as handle:
+                handle.write(sound.get_raw())
+            os.replace(cache_path + ".tmp", cache_path)
+        except OSError as error:
+            print(f"[AUDIO] Could not cache decoded {path}: {error}")
+        return sound
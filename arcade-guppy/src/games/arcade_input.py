@@ -0,0 +1,111 @@
+"""Hot-plug aware joystick state shared by the cabinet games; feed every event through handle_event()"""
+import pygame
+
+DEFAULT_DEADZONE = 0.3
+
+
+class JoystickManager:
+    def __init__(self, deadzone=DEFAULT_DEADZONE):
+        pygame.joystick.init()
+        self.deadzone = deadzone
+        self.devices = {}
+        self.axes = {}
+        self.hats = {}
+        self.hat_axis = {}
+        self.buttons = {}
+        self.active_id = None
+        for index in range(pygame.joystick.get_count()):
+            self._add(index)
+
+    @property
+    def active(self):
+        return self.devices.get(self.active_id)
+
+    def handle_event(self, event):
+        if event.type == pygame.JOYDEVICEADDED:
+            self._add(event.device_index)
+        elif event.type == pygame.JOYDEVICEREMOVED:
+            self._remove(event.instance_id)
+        elif event.type == pygame.JOYAXISMOTION:
+            axes = self.axes.get(event.instance_id)
+            if axes is None or event.axis >= len(axes):
+                return True
+            axes[event.axis] = event.value
+            if abs(event.value) > self.deadzone:
+                self.active_id = event.instance_id
+        elif event.type == pygame.JOYHATMOTION:
+            if event.hat == 0 and event.instance_id in self.hats:
+                old_x, old_y = self.hats[event.instance_id]
+                hat_x, hat_y = event.value
+                # on an 8-way diagonal the axis that was just pressed wins; from neutral, horizontal
+                if not (hat_x and hat_y) or not old_x:
+                    self.hat_axis[event.instance_id] = 0
+                elif not old_y:
+                    self.hat_axis[event.instance_id] = 1
+                self.hats[event.instance_id] = event.value
+                if event.value != (0, 0):
+                    self.active_id = event.instance_id
+        elif event.type == pygame.JOYBUTTONDOWN:
+            if event.instance_id in self.buttons:
+                self.buttons[event.instance_id].add(event.button)
+                self.active_id = event.instance_id
+        elif event.type == pygame.JOYBUTTONUP:
+            if event.instance_id in self.buttons:
+                self.buttons[event.instance_id].discard(event.button)
+        else:
+            return False
+        return True
+
+    def axis(self, index, instance_id=None):
+        axes = self.axes.get(self.active_id if instance_id is None else instance_id)
+        if not axes or index >= len(axes):
+            return 0.0
+        return axes[index]
+
+    def direction(self):
+        """Dominant direction of the active pad as a 4-way (dx, dy), hat before stick"""
+        if self.active_id is None:
+            return (0, 0)
+        hat_x, hat_y = self.hats.get(self.active_id, (0, 0))
+        if hat_x and hat_y:
+            if self.hat_axis.get(self.active_id, 0) == 0:
+                return (hat_x, 0)
+            return (0, -hat_y)
+        if hat_x or hat_y:
+            return (hat_x, -hat_y)
+        axis_x = self.axis(0)
+        axis_y = self.axis(1)
+        if max(abs(axis_x), abs(axis_y)) <= self.deadzone:
+            return (0, 0)
+        if abs(axis_x) > abs(axis_y):
+            return (-1 if axis_x < 0 else 1, 0)
+        return (0, -1 if axis_y < 0 else 1)
+
+    def button_held(self, buttons):
+        return any(not held.isdisjoint(buttons) for held in self.buttons.values())
+
+    def _add(self, device_index):
+        try:
+            joystick = pygame.joystick.Joystick(device_index)
+            joystick.init()
+        except pygame.error:
+            return
+        instance_id = joystick.get_instance_id()
+        if instance_id in self.devices:
+            return
+        self.devices[instance_id] = joystick
+        self.axes[instance_id] = [0.0] * joystick.get_numaxes()
+        self.hats[instance_id] = (0, 0)
+        self.hat_axis[instance_id] = 0
+        self.buttons[instance_id] = set()
+        if self.active_id is None:
+            self.active_id = instance_id
+
+    def _remove(self, instance_id):
+        self.devices.pop(instance_id, None)
+        self.axes.pop(instance_id, None)
+        self.hats.pop(instance_id, None)
+        self.hat_axis.pop(instance_id, None)
+        self.buttons.pop(instance_id, None)
+        if self.active_id == instance_id:
+            self.active_id = next(iter(self.devices), None)
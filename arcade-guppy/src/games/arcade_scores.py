@@ -0,0 +1,140 @@
+"""Persistent high scores shared by the cabinet games, kept in one SQLite file written from a background thread"""
+import atexit
+import datetime
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+SUMMARY_SIZE = 10
+
+SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS scores (
+        id INTEGER PRIMARY KEY,
+        game TEXT NOT NULL,
+        player TEXT NOT NULL,
+        score INTEGER NOT NULL,
+        day TEXT NOT NULL,
+        created_at REAL NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS scores_by_game ON scores (game, score DESC)",
+    "CREATE INDEX IF NOT EXISTS scores_by_game_day ON scores (game, day, score DESC)",
+)
+
+
+def resolve_scores_path():
+    explicit_path = os.environ.get("ARCADE_SCORES_PATH", "").strip()
+    if explicit_path:
+        return os.path.abspath(explicit_path)
+    return os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "data", "highscores.sqlite3"))
+
+
+def today():
+    return datetime.date.today().isoformat()
+
+
+def open_store(path):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    connection = sqlite3.connect(path, timeout=5.0)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=FULL")
+    with connection:
+        for statement in SCHEMA:
+            connection.execute(statement)
+    return connection
+
+
+class Leaderboard:
+    def __init__(self, game, path=None, summary_size=SUMMARY_SIZE):
+        self.game = game
+        self.path = path or resolve_scores_path()
+        self.summary_size = summary_size
+        self._all_time = []
+        self._by_day = {}
+        self._lock = threading.Lock()
+        self._loaded = threading.Event()
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._worker, name=f"{game}-scores", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, score, player="AAA"):
+        score = int(score)
+        if score <= 0:
+            return
+        entry = (score, player, today())
+        with self._lock:
+            self._insert(self._all_time, entry)
+            self._insert(self._by_day.setdefault(entry[2], []), entry)
+        self._queue.put(entry)
+
+    def top(self, count=SUMMARY_SIZE, day=None):
+        with self._lock:
+            entries = self._all_time if day is None else self._by_day.get(day, [])
+            return entries[:count]
+
+    def best(self, day=None):
+        entries = self.top(1, day)
+        return entries[0][0] if entries else 0
+
+    def wait_loaded(self, timeout=None):
+        return self._loaded.wait(timeout)
+
+    def close(self, timeout=1.0):
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join(timeout=timeout)
+
+    def _insert(self, entries, entry):
+        index = len(entries)
+        while index > 0 and entries[index - 1][0] < entry[0]:
+            index -= 1
+        if index < self.summary_size:
+            entries.insert(index, entry)
+            del entries[self.summary_size:]
+
+    def _load_summary(self, connection):
+        all_time = connection.execute(
+            "SELECT score, player, day FROM scores WHERE game = ? ORDER BY score DESC, id LIMIT ?",
+            (self.game, self.summary_size),
+        ).fetchall()
+        day = today()
+        by_day = connection.execute(
+            "SELECT score, player, day FROM scores WHERE game = ? AND day = ? ORDER BY score DESC, id LIMIT ?",
+            (self.game, day, self.summary_size),
+        ).fetchall()
+        with self._lock:
+            for entry in all_time:
+                self._insert(self._all_time, tuple(entry))
+            for entry in by_day:
+                self._insert(self._by_day.setdefault(day, []), tuple(entry))
+
+    def _worker(self):
+        try:
+            connection = open_store(self.path)
+            self._load_summary(connection)
+        except (OSError, sqlite3.Error) as error:
+            print(f"[SCORES] High scores disabled ({self.path}): {error}")
+            self._loaded.set()
+            return
+        self._loaded.set()
+
+        while True:
+            entry = self._queue.get()
+            if entry is None:
+                break
+            score, player, day = entry
+            try:
+                with connection:
+                    connection.execute(
+                        "INSERT INTO scores (game, player, score, day, created_at) VALUES (?, ?, ?, ?, ?)",
+                        (self.game, player, score, day, time.time()),
+                    )
+            except sqlite3.Error as error:
+                print(f"[SCORES] Failed to save {self.game} score {score}: {error}")
+        connection.close()
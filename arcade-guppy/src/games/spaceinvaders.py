@@ -3,6 +3,10 @@ import random
 import sys
 import math
 import os
+import json
+from itertools import islice
+
+from arcade_scores import Leaderboard
 DEFAULT_SCREEN_WIDTH = 800
 DEFAULT_SCREEN_HEIGHT = 600
 SCREEN_WIDTH = DEFAULT_SCREEN_WIDTH
@@ -10,8 +14,27 @@ SCREEN_HEIGHT = DEFAULT_SCREEN_HEIGHT
 PLAYER_SPEED = 9
 BULLET_SPEED = 10
 ALIEN_SPAWN_RATE = 35
+ALIEN_FIRE_CHANCE = 0.03
+MAX_SPEED_SCALE = 2.0
+ALIEN_SPAWN_Y = -50
 POWERUP_SPEED = 3
+MAX_PARTICLES = 1024
+MAX_BULLETS = 64
+MAX_ALIEN_BULLETS = 128
+MAX_POWERUPS = 16
+SHIELD_FRAMES = 24
+STAR_LAYERS = (
+    (45, 0.6, 1, (100, 160)),
+    (35, 1.1, 2, (140, 210)),
+    (20, 1.8, 3, (190, 255)),
+)
+ENGINE_GLOW_FRAMES = 20
+PARTICLE_LIFETIME = 40
+PARTICLE_MAX_SIZE = 6
 JOYSTICK_DEADZONE = 0.25
+FIRE_NONE = 0
+FIRE_HELD = 1
+FIRE_PRESSED = 2
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
 RED = (255, 0, 0)
@@ -40,6 +63,9 @@ def parse_window_size(raw_value):
         return None
 
 embedded_mode = os.environ.get('ARCADE_EMBEDDED') == '1'
+debug_overlay = os.environ.get('SPACE_BATTLE_DEBUG') == '1'
+headless_mode = os.environ.get('SPACE_BATTLE_HEADLESS') == '1'
+wave_script_path = os.environ.get('SPACE_BATTLE_WAVES') or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'spaceinvaders_waves.json')
 window_size = parse_window_size(os.environ.get('ARCADE_WINDOW_SIZE'))
 window_pos = os.environ.get('ARCADE_WINDOW_POS')
 
@@ -48,6 +74,9 @@ if window_size:
 
 if window_pos:
     os.environ['SDL_VIDEO_WINDOW_POS'] = window_pos
+if headless_mode:
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
 pygame.init()
 try:
     pygame.font.init()
@@ -59,92 +88,497 @@ if joystick:
     joystick.init()
 
 display_flags = pygame.NOFRAME | pygame.SCALED
-if not embedded_mode:
+if headless_mode:
+    display_flags = 0
+elif not embedded_mode:
     display_flags |= pygame.FULLSCREEN
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), display_flags)
 pygame.display.set_caption("Space Battle - Alien Invasion")
 clock = pygame.time.Clock()
-def get_font(size):
+rng = random.Random()
+fx_rng = random.Random()
+_font_cache = {}
+def load_font(size, name=None, bold=False):
     """Get font with fallback for Python 3.14 compatibility"""
     system_fonts = ['arial', 'helvetica', 'courier', 'times', 'verdana', 'dejavusans']
-    
+    if name:
+        system_fonts.insert(0, name)
+
     for font_name in system_fonts:
         try:
-            return pygame.font.SysFont(font_name, size)
+            return pygame.font.SysFont(font_name, size, bold)
         except:
             continue
     try:
         default_font = pygame.font.get_default_font()
         if default_font:
-            return pygame.font.SysFont(default_font, size)
+            return pygame.font.SysFont(default_font, size, bold)
     except:
         pass
     try:
         return pygame.font.Font(None, size)
     except:
         return None
-class Star:
+
+def get_font(size, name=None, bold=False):
+    key = (name, size, bold)
+    if key not in _font_cache:
+        _font_cache[key] = load_font(size, name, bold)
+    return _font_cache[key]
+class TextCache:
+    """Rendered text surfaces, re-rendered only when the text or colour changes"""
+    def __init__(self):
+        self.entries = {}
+
+    def render(self, slot, font, text, color):
+        entry = self.entries.get(slot)
+        if entry is not None and entry[0] == (font, text, color):
+            return entry[1]
+        surface = font.render(text, True, color)
+        self.entries[slot] = ((font, text, color), surface)
+        return surface
+def render_player_sprite():
+    surface = pygame.Surface((60, 50), pygame.SRCALPHA)
+    body_color = (200, 200, 220)
+    pygame.draw.polygon(surface, body_color, [
+        (30, 0),
+        (15, 20),
+        (20, 35),
+        (10, 50),
+        (50, 50),
+        (40, 35),
+        (45, 20),
+    ])
+    pygame.draw.ellipse(surface, (100, 200, 255), (22, 8, 16, 18))
+    pygame.draw.ellipse(surface, (200, 240, 255), (24, 10, 12, 12))
+    wing_color = (150, 150, 180)
+    pygame.draw.polygon(surface, wing_color, [(20, 20), (0, 30), (5, 40), (20, 35)])
+    pygame.draw.polygon(surface, wing_color, [(40, 20), (60, 30), (55, 40), (40, 35)])
+    pygame.draw.line(surface, CYAN, (30, 5), (30, 25), 2)
+    pygame.draw.circle(surface, (80, 80, 100), (15, 48), 4)
+    pygame.draw.circle(surface, (80, 80, 100), (45, 48), 4)
+    pygame.draw.circle(surface, ORANGE, (15, 48), 2)
+    pygame.draw.circle(surface, ORANGE, (45, 48), 2)
+    pygame.draw.line(surface, (150, 150, 170), (25, 15), (25, 30), 1)
+    pygame.draw.line(surface, (150, 150, 170), (35, 15), (35, 30), 1)
+    return surface
+
+def render_bullet_sprite():
+    surface = pygame.Surface((4, 18), pygame.SRCALPHA)
+    pygame.draw.rect(surface, CYAN, (0, 0, 4, 18))
+    pygame.draw.rect(surface, WHITE, (1, 0, 2, 6))
+    return surface
+
+def render_alien_sprite(alien_type):
+    surface = pygame.Surface((50, 50), pygame.SRCALPHA)
+
+    if alien_type == 0:
+        color = RED
+        pygame.draw.circle(surface, color, (25, 20), 18)
+        pygame.draw.circle(surface, (255, 255, 0), (17, 17), 6)
+        pygame.draw.circle(surface, (255, 255, 0), (33, 17), 6)
+        pygame.draw.circle(surface, BLACK, (17, 17), 3)
+        pygame.draw.circle(surface, BLACK, (33, 17), 3)
+        for i in range(5):
+            x = 8 + i * 8
+            pygame.draw.line(surface, color, (x, 35), (x - 3, 48), 3)
+
+    elif alien_type == 1:
+        color = PURPLE
+        pygame.draw.ellipse(surface, color, (10, 15, 30, 25))
+        pygame.draw.circle(surface, color, (25, 12), 10)
+        pygame.draw.circle(surface, (0, 255, 0), (20, 10), 4)
+        pygame.draw.circle(surface, (0, 255, 0), (30, 10), 4)
+        pygame.draw.circle(surface, BLACK, (20, 10), 2)
+        pygame.draw.circle(surface, BLACK, (30, 10), 2)
+        pygame.draw.line(surface, color, (18, 8), (12, 0), 2)
+        pygame.draw.line(surface, color, (32, 8), (38, 0), 2)
+        pygame.draw.circle(surface, (255, 255, 0), (12, 0), 2)
+        pygame.draw.circle(surface, (255, 255, 0), (38, 0), 2)
+        for i in range(3):
+            y = 20 + i * 5
+            pygame.draw.line(surface, color, (10, y), (3, y + 8), 2)
+            pygame.draw.line(surface, color, (40, y), (47, y + 8), 2)
+
+    else:
+        color = ORANGE
+        pygame.draw.ellipse(surface, color, (5, 20, 40, 15))
+        pygame.draw.ellipse(surface, (255, 200, 0), (10, 18, 30, 10))
+        pygame.draw.ellipse(surface, (200, 100, 0), (15, 10, 20, 18))
+        pygame.draw.ellipse(surface, (255, 255, 100), (18, 12, 14, 12))
+        for i in range(4):
+            x = 12 + i * 8
+            pygame.draw.circle(surface, CYAN, (x, 27), 2)
+
+    return surface
+
+def render_alien_bullet_sprite():
+    surface = pygame.Surface((6, 16), pygame.SRCALPHA)
+    pygame.draw.ellipse(surface, RED, (0, 0, 6, 16))
+    pygame.draw.ellipse(surface, ORANGE, (1, 2, 4, 12))
+    pygame.draw.ellipse(surface, YELLOW, (2, 4, 2, 8))
+    return surface
+
+def render_powerup_sprite(powerup_type):
+    surface = pygame.Surface((25, 25), pygame.SRCALPHA)
+    if powerup_type == "triple":
+        pygame.draw.circle(surface, ORANGE, (12, 12), 12)
+        pygame.draw.circle(surface, YELLOW, (12, 12), 10)
+        font = get_font(20)
+        if font:
+            surface.blit(font.render("3X", True, BLACK), (4, 6))
+
+    elif powerup_type == "shield":
+        pygame.draw.circle(surface, CYAN, (12, 12), 12)
+        pygame.draw.circle(surface, BLUE, (12, 12), 10)
+        points = []
+        for i in range(6):
+            angle = math.pi / 3 * i
+            x = 12 + 7 * math.cos(angle)
+            y = 12 + 7 * math.sin(angle)
+            points.append((x, y))
+        pygame.draw.polygon(surface, WHITE, points, 2)
+    return surface
+
+def render_shield_frames():
+    """Hexagon shield at each rotation step across its 60 degree symmetry"""
+    frames = []
+    for frame in range(SHIELD_FRAMES):
+        surface = pygame.Surface((90, 80), pygame.SRCALPHA)
+        angle_offset = math.pi / 3 * frame / SHIELD_FRAMES
+        points = []
+        for i in range(6):
+            angle = math.pi / 3 * i + angle_offset
+            points.append((45 + 38 * math.cos(angle), 40 + 38 * math.sin(angle)))
+        pygame.draw.polygon(surface, (*CYAN, 255), points, 3)
+        pygame.draw.polygon(surface, (*BLUE, 127), points, 1)
+        frames.append(surface.convert_alpha())
+    return frames
+
+def render_engine_glow_frames():
+    frames = []
+    for frame in range(ENGINE_GLOW_FRAMES):
+        surface = pygame.Surface((14, 14), pygame.SRCALPHA)
+        pygame.draw.circle(surface, (255, 150 + frame * 5, 0), (7, 7), 3 + frame // 5)
+        frames.append(surface.convert_alpha())
+    return frames
+
+_background_cache = {}
+def get_background(size):
+    """Vertical gradient rendered once per resolution as a 1 px strip scaled to the screen"""
+    if size not in _background_cache:
+        width, height = size
+        strip = pygame.Surface((1, height))
+        for y in range(height):
+            color_value = int(10 + (y / height) * 20)
+            strip.set_at((0, y), (color_value, color_value, color_value + 20))
+        _background_cache[size] = pygame.transform.scale(strip, size).convert()
+    return _background_cache[size]
+
+class SpriteAtlas:
+    """Entity surfaces drawn once at startup and shared by every instance"""
     def __init__(self):
-        self.x = random.randint(0, SCREEN_WIDTH)
-        self.y = random.randint(0, SCREEN_HEIGHT)
-        self.speed = random.uniform(0.5, 2)
-        self.brightness = random.randint(100, 255)
-        self.size = random.randint(1, 3)
-    
+        self.player = render_player_sprite().convert_alpha()
+        self.shield_frames = render_shield_frames()
+        self.engine_glow_frames = render_engine_glow_frames()
+        self.bullet = render_bullet_sprite().convert_alpha()
+        self.alien_bullet = render_alien_bullet_sprite().convert_alpha()
+        self.aliens = [render_alien_sprite(alien_type).convert_alpha() for alien_type in range(3)]
+        self.powerups = {
+            powerup_type: render_powerup_sprite(powerup_type).convert_alpha()
+            for powerup_type in ("triple", "shield")
+        }
+
+sprites = SpriteAtlas()
+def compact(entities):
+    """Swap-remove every entity flagged dead, in place"""
+    i = 0
+    while i < len(entities):
+        if entities[i].alive:
+            i += 1
+        else:
+            entities[i] = entities[-1]
+            entities.pop()
+class EntityPool:
+    """Fixed-capacity entity pool; spawns pop a free list instead of allocating"""
+    def __init__(self, factory, capacity):
+        self.capacity = capacity
+        self.free = [factory() for _ in range(capacity)]
+        self.active = []
+        self.high_water = 0
+
+    def spawn(self, *args):
+        if not self.free:
+            return None
+        entity = self.free.pop()
+        entity.spawn(*args)
+        self.active.append(entity)
+        if len(self.active) > self.high_water:
+            self.high_water = len(self.active)
+        return entity
+
+    def compact(self):
+        active = self.active
+        i = 0
+        while i < len(active):
+            if active[i].alive:
+                i += 1
+            else:
+                self.free.append(active[i])
+                active[i] = active[-1]
+                active.pop()
+
+    def reset(self):
+        for entity in self.active:
+            entity.alive = False
+        self.compact()
+DEFAULT_WAVE_SCRIPT = {
+    "waves_per_cycle": 16,
+    "type_weights": [0.55, 0.27, 0.18],
+    "scaling": {
+        "spawn_interval": {"base": ALIEN_SPAWN_RATE, "step": -2, "min": 12},
+        "target_aliens": {"base": 10, "step": 2, "max": 24},
+        "wave_size": {"base": 2, "step": 1, "every": 3, "max": 4},
+        "speed_scale": {"base": 0.92, "step": 0.08, "max": MAX_SPEED_SCALE},
+        "fire_chance": {"base": ALIEN_FIRE_CHANCE},
+    },
+    "formations": {
+        "scatter": {"spacing": 70, "margin": 60},
+    },
+    "levels": {
+        "default": [{"formation": "scatter"}],
+    },
+}
+ALIEN_PATHS = ("straight", "wobble", "wobble")
+PATH_STEPS = 126
+def build_path_tables():
+    """Per-frame (dx, dy) offsets for every alien path, indexed by phase"""
+    step = math.pi * 2 / PATH_STEPS
+    half = PATH_STEPS // 2
+    return {
+        "straight": tuple((0, 0) for i in range(PATH_STEPS)),
+        "wobble": tuple((math.sin(i * step) * 1.5, 0) for i in range(PATH_STEPS)),
+        "zigzag": tuple((2 if i < half else -2, 0) for i in range(PATH_STEPS)),
+        "swoop": tuple((math.cos(i * step) * 3, max(0, math.sin(i * step)) * 1.5) for i in range(PATH_STEPS)),
+    }
+PATH_TABLES = build_path_tables()
+class CompiledLevel:
+    """One level's spawn schedule, indexed by frame within a repeating cycle"""
+    def __init__(self, schedule, target_aliens, speed_scale):
+        self.schedule = schedule
+        self.period = len(schedule)
+        self.target_aliens = target_aliens
+        self.speed_scale = speed_scale
+class WaveScript:
+    """Designer-authored wave definitions compiled into per-level spawn schedules"""
+    def __init__(self, data):
+        self.data = data
+        # compile every authored level once so a broken script fails at load, not mid-game
+        for key in data["levels"]:
+            if key != "default":
+                self.compile(int(key), random.Random(0))
+
+    @classmethod
+    def load(cls, path):
+        data = dict(DEFAULT_WAVE_SCRIPT)
+        try:
+            with open(path, "r", encoding="utf-8") as handle:
+                authored = json.load(handle)
+            for key in ("scaling", "formations", "levels"):
+                data[key] = {**DEFAULT_WAVE_SCRIPT[key], **authored.pop(key, {})}
+            data.update(authored)
+        except (OSError, ValueError) as error:
+            print(f"[SPACE BATTLE] Using built-in waves: {error}")
+            data = DEFAULT_WAVE_SCRIPT
+        return cls(data)
+
+    def with_difficulty(self, spawn_rate=None, speed_cap=None, fire_chance=None):
+        data = json.loads(json.dumps(self.data))
+        scaling = data["scaling"]
+        if spawn_rate is not None:
+            scaling["spawn_interval"]["base"] = spawn_rate
+        if speed_cap is not None:
+            scaling["speed_scale"]["max"] = speed_cap
+        if fire_chance is not None:
+            scaling["fire_chance"]["base"] = fire_chance
+        return WaveScript(data)
+
+    def scaled(self, name, level):
+        rule = self.data["scaling"][name]
+        value = rule["base"] + rule.get("step", 0) * (level // rule.get("every", 1))
+        if "min" in rule:
+            value = max(rule["min"], value)
+        if "max" in rule:
+            value = min(rule["max"], value)
+        return value
+
+    def formation_positions(self, formation, count, layout_rng):
+        if "offsets" in formation:
+            offsets = formation["offsets"][:count]
+            reach = max(abs(dx) for dx, dy in offsets) + formation.get("margin", 60)
+            center = layout_rng.randint(reach, max(reach, SCREEN_WIDTH - reach))
+            return [(center + dx, ALIEN_SPAWN_Y + dy) for dx, dy in offsets]
+        columns = list(range(formation["margin"], SCREEN_WIDTH - formation["margin"] + 1, formation["spacing"]))
+        layout_rng.shuffle(columns)
+        return [(x, ALIEN_SPAWN_Y) for x in columns[:count]]
+
+    def compile(self, level, layout_rng):
+        """One spawn cycle of a level, laid out by layout_rng"""
+        waves = self.data["levels"].get(str(level), self.data["levels"]["default"])
+        interval = int(self.scaled("spawn_interval", level))
+        wave_size = int(self.scaled("wave_size", level))
+        fire_chance = self.scaled("fire_chance", level)
+        schedule = [()] * (interval * self.data["waves_per_cycle"])
+        for index in range(self.data["waves_per_cycle"]):
+            wave = waves[index % len(waves)]
+            formation = self.data["formations"][wave.get("formation", "scatter")]
+            positions = self.formation_positions(formation, wave.get("count", wave_size), layout_rng)
+            events = []
+            for slot, (x, y) in enumerate(positions):
+                if "types" in wave:
+                    alien_type = wave["types"][slot % len(wave["types"])]
+                else:
+                    alien_type = layout_rng.choices(range(3), self.data["type_weights"])[0]
+                path = wave.get("path")
+                if path not in PATH_TABLES:
+                    path = ALIEN_PATHS[alien_type]
+                events.append((x, y, alien_type, path, fire_chance * wave.get("fire", 1.0)))
+            schedule[index * interval] = tuple(events)
+        return CompiledLevel(
+            schedule,
+            int(self.scaled("target_aliens", level)),
+            self.scaled("speed_scale", level),
+        )
+class SpatialGrid:
+    """Uniform-grid broad phase over entity rects, rebuilt every frame"""
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        self.cells = {}
+
+    def cell_span(self, rect):
+        size = self.cell_size
+        return (range(rect.left // size, (rect.right - 1) // size + 1),
+                range(rect.top // size, (rect.bottom - 1) // size + 1))
+
+    def rebuild(self, entities):
+        self.cells.clear()
+        for entity in entities:
+            if not entity.alive:
+                continue
+            columns, rows = self.cell_span(entity.rect)
+            for cx in columns:
+                for cy in rows:
+                    bucket = self.cells.get((cx, cy))
+                    if bucket is None:
+                        self.cells[(cx, cy)] = [entity]
+                    else:
+                        bucket.append(entity)
+
+    def colliding(self, rect):
+        hits = []
+        columns, rows = self.cell_span(rect)
+        for cx in columns:
+            for cy in rows:
+                for entity in self.cells.get((cx, cy), ()):
+                    if entity.alive and entity not in hits and entity.rect.colliderect(rect):
+                        hits.append(entity)
+        return hits
+class Starfield:
+    """Pre-rendered, vertically tileable star layers scrolled at different speeds"""
+    def __init__(self, width, height):
+        self.height = height
+        self.layers = []
+        for count, speed, size, (dim, bright) in STAR_LAYERS:
+            surface = pygame.Surface((width, height)).convert()
+            surface.fill(BLACK)
+            for _ in range(count):
+                x = fx_rng.randint(0, width)
+                y = fx_rng.randint(0, height)
+                brightness = fx_rng.randint(dim, bright)
+                for wrap_y in (y - height, y, y + height):
+                    pygame.draw.circle(surface, (brightness, brightness, brightness), (x, wrap_y), size)
+            surface.set_colorkey(BLACK, pygame.RLEACCEL)
+            self.layers.append([surface, speed, 0.0])
+
     def update(self):
-        self.y += self.speed
-        if self.y > SCREEN_HEIGHT:
-            self.y = 0
-            self.x = random.randint(0, SCREEN_WIDTH)
-    
+        for layer in self.layers:
+            layer[2] = (layer[2] + layer[1]) % self.height
+
     def draw(self, surface):
-        color = (self.brightness, self.brightness, self.brightness)
-        pygame.draw.circle(surface, color, (int(self.x), int(self.y)), self.size)
+        for layer, speed, offset in self.layers:
+            y = int(offset)
+            surface.blit(layer, (0, y))
+            surface.blit(layer, (0, y - self.height))
 class Particle:
-    def __init__(self, x, y, color):
-        self.x = x
-        self.y = y
-        self.color = color
-        self.vx = random.uniform(-4, 4)
-        self.vy = random.uniform(-4, 4)
-        self.lifetime = 40
-        self.size = random.randint(2, 6)
+    __slots__ = ("x", "y", "vx", "vy", "size", "lifetime", "dots", "alive")
 
-    def update(self):
-        self.x += self.vx
-        self.y += self.vy
-        self.vy += 0.2
-        self.lifetime -= 1
-        self.size = max(1, self.size - 0.1)
+    def __init__(self):
+        self.alive = False
 
-    def draw(self, surface):
-        if self.lifetime > 0:
-            alpha = int(255 * (self.lifetime / 40))
-            pygame.draw.circle(surface, self.color, (int(self.x), int(self.y)), int(self.size))
+    def spawn(self, x, y, dots):
+        self.x = x
+        self.y = y
+        self.vx = fx_rng.uniform(-4, 4)
+        self.vy = fx_rng.uniform(-4, 4)
+        self.size = fx_rng.randint(2, PARTICLE_MAX_SIZE)
+        self.lifetime = PARTICLE_LIFETIME
+        self.dots = dots
+        self.alive = True
 class ParticleSystem:
-    def __init__(self):
-        self.particles = []
+    """Pooled particles drawn from pre-rendered dots with one batched blits call"""
+    def __init__(self, capacity=MAX_PARTICLES):
+        self.pool = EntityPool(Particle, capacity)
+        self.particles = self.pool.active
+        self.palette = {}
+        self.batch = [[None, [0, 0]] for _ in range(capacity)]
+
+    def color_dots(self, color):
+        dots = self.palette.get(color)
+        if dots is None:
+            dots = [None]
+            for radius in range(1, PARTICLE_MAX_SIZE + 1):
+                dot = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+                pygame.draw.circle(dot, color, (radius, radius), radius)
+                dots.append(dot.convert_alpha())
+            self.palette[color] = dots
+        return dots
 
     def emit(self, x, y, color, count=15):
+        dots = self.color_dots(color)
         for _ in range(count):
-            self.particles.append(Particle(x, y, color))
+            if self.pool.spawn(x, y, dots) is None:
+                break
 
     def update(self):
-        self.particles = [p for p in self.particles if p.lifetime > 0]
         for particle in self.particles:
-            particle.update()
+            if particle.lifetime <= 1:
+                particle.alive = False
+                continue
+            particle.x += particle.vx
+            particle.y += particle.vy
+            particle.vy += 0.2
+            particle.lifetime -= 1
+            if particle.size > 1:
+                particle.size = max(1.0, particle.size - 0.1)
+        self.pool.compact()
 
     def draw(self, surface):
-        for particle in self.particles:
-            particle.draw(surface)
+        for entry, particle in zip(self.batch, self.particles):
+            radius = int(particle.size)
+            entry[0] = particle.dots[radius]
+            dest = entry[1]
+            dest[0] = int(particle.x) - radius
+            dest[1] = int(particle.y) - radius
+        surface.blits(islice(self.batch, len(self.particles)), doreturn=False)
 class Player:
-    def __init__(self):
+    def __init__(self, bullet_pool):
         self.width = 60
         self.height = 50
-        self.image = self.create_spaceship()
+        self.image = sprites.player
         self.rect = self.image.get_rect(midbottom=(SCREEN_WIDTH / 2, SCREEN_HEIGHT - 40))
         self.speed = PLAYER_SPEED
-        self.bullets = []
+        self.bullet_pool = bullet_pool
+        self.bullets = bullet_pool.active
         self.shoot_delay = 0
         self.max_shoot_delay = 10
         self.powerup_active = False
@@ -153,33 +587,6 @@ class Player:
         self.shield_timer = 0
         self.engine_glow = 0
 
-    def create_spaceship(self):
-        surface = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        body_color = (200, 200, 220)
-        pygame.draw.polygon(surface, body_color, [
-            (30, 0),
-            (15, 20),
-            (20, 35),
-            (10, 50),
-            (50, 50),
-            (40, 35),
-            (45, 20),
-        ])
-        pygame.draw.ellipse(surface, (100, 200, 255), (22, 8, 16, 18))
-        pygame.draw.ellipse(surface, (200, 240, 255), (24, 10, 12, 12))
-        wing_color = (150, 150, 180)
-        pygame.draw.polygon(surface, wing_color, [(20, 20), (0, 30), (5, 40), (20, 35)])
-        pygame.draw.polygon(surface, wing_color, [(40, 20), (60, 30), (55, 40), (40, 35)])
-        pygame.draw.line(surface, CYAN, (30, 5), (30, 25), 2)
-        pygame.draw.circle(surface, (80, 80, 100), (15, 48), 4)
-        pygame.draw.circle(surface, (80, 80, 100), (45, 48), 4)
-        pygame.draw.circle(surface, ORANGE, (15, 48), 2)
-        pygame.draw.circle(surface, ORANGE, (45, 48), 2)
-        pygame.draw.line(surface, (150, 150, 170), (25, 15), (25, 30), 1)
-        pygame.draw.line(surface, (150, 150, 170), (35, 15), (35, 30), 1)
-        
-        return surface
-
     def move(self, direction):
         if direction == "left" and self.rect.left > 0:
             self.rect.x -= self.speed
@@ -189,22 +596,22 @@ class Player:
     def shoot(self):
         if self.shoot_delay <= 0:
             if self.powerup_active:
-                self.bullets.append(Bullet(self.rect.centerx, self.rect.top, 0))
-                self.bullets.append(Bullet(self.rect.centerx - 20, self.rect.top + 10, -1))
-                self.bullets.append(Bullet(self.rect.centerx + 20, self.rect.top + 10, 1))
+                self.bullet_pool.spawn(self.rect.centerx, self.rect.top, 0)
+                self.bullet_pool.spawn(self.rect.centerx - 20, self.rect.top + 10, -1)
+                self.bullet_pool.spawn(self.rect.centerx + 20, self.rect.top + 10, 1)
             else:
-                bullet = Bullet(self.rect.centerx, self.rect.top, 0)
-                self.bullets.append(bullet)
+                self.bullet_pool.spawn(self.rect.centerx, self.rect.top, 0)
             self.shoot_delay = self.max_shoot_delay
 
     def update_bullets(self):
         if self.shoot_delay > 0:
             self.shoot_delay -= 1
         
-        for bullet in self.bullets[:]:
+        for bullet in self.bullets:
             bullet.move()
             if bullet.rect.bottom < 0:
-                self.bullets.remove(bullet)
+                bullet.alive = False
+        self.bullet_pool.compact()
 
     def update_powerups(self):
         if self.powerup_active:
@@ -226,121 +633,71 @@ class Player:
             self.shield_timer = 400
 
     def draw(self, surface):
-        self.engine_glow = (self.engine_glow + 1) % 20
-        glow_size = 3 + self.engine_glow // 5
-        engine_color = (255, int(150 + self.engine_glow * 5), 0)
-        pygame.draw.circle(surface, engine_color, 
-                         (self.rect.left + 15, self.rect.bottom - 2), glow_size)
-        pygame.draw.circle(surface, engine_color, 
-                         (self.rect.right - 15, self.rect.bottom - 2), glow_size)
+        self.engine_glow = (self.engine_glow + 1) % ENGINE_GLOW_FRAMES
+        glow = sprites.engine_glow_frames[self.engine_glow]
+        surface.blit(glow, (self.rect.left + 8, self.rect.bottom - 9))
+        surface.blit(glow, (self.rect.right - 22, self.rect.bottom - 9))
         surface.blit(self.image, self.rect)
         if self.shield_active:
             time = pygame.time.get_ticks()
-            alpha = int(100 + 50 * math.sin(time / 100))
-            shield_surface = pygame.Surface((self.width + 30, self.height + 30), pygame.SRCALPHA)
-            center_x = self.width // 2 + 15
-            center_y = self.height // 2 + 15
-            radius = 38
-            angle_offset = time / 500
-            points = []
-            for i in range(6):
-                angle = math.pi / 3 * i + angle_offset
-                x = center_x + radius * math.cos(angle)
-                y = center_y + radius * math.sin(angle)
-                points.append((x, y))
-            
-            pygame.draw.polygon(shield_surface, (*CYAN, alpha), points, 3)
-            pygame.draw.polygon(shield_surface, (*BLUE, alpha // 2), points, 1)
-            
-            surface.blit(shield_surface, (self.rect.x - 15, self.rect.y - 15))
+            rotation = int(time / 500 / (math.pi / 3) * SHIELD_FRAMES) % SHIELD_FRAMES
+            shield = sprites.shield_frames[rotation]
+            shield.set_alpha(int(100 + 50 * math.sin(time / 100)))
+            surface.blit(shield, (self.rect.x - 15, self.rect.y - 15))
 class Bullet:
-    def __init__(self, x, y, angle=0):
+    __slots__ = ("width", "height", "image", "rect", "speed", "alive", "angle")
+
+    def __init__(self):
         self.width = 4
         self.height = 18
-        self.image = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        pygame.draw.rect(self.image, CYAN, (0, 0, 4, 18))
-        pygame.draw.rect(self.image, WHITE, (1, 0, 2, 6))
-        
-        self.rect = self.image.get_rect(center=(x, y))
+        self.image = sprites.bullet
+        self.rect = self.image.get_rect()
         self.speed = BULLET_SPEED
+        self.alive = False
+        self.angle = 0
+
+    def spawn(self, x, y, angle=0):
+        self.rect.center = (x, y)
+        self.alive = True
         self.angle = angle
 
     def move(self):
         self.rect.y -= self.speed
         self.rect.x += self.angle * 2
 class Alien:
-    def __init__(self, x, alien_type=0, speed_scale=1.0):
+    def __init__(self, x, y=ALIEN_SPAWN_Y, alien_type=0, speed_scale=1.0, path=None, fire_chance=ALIEN_FIRE_CHANCE):
         self.type = alien_type
+        self.path = path or ALIEN_PATHS[alien_type]
+        self.path_table = PATH_TABLES[self.path]
+        self.fire_chance = fire_chance
         self.width = 50
         self.height = 50
-        self.image = self.create_alien()
-        self.rect = self.image.get_rect(center=(x, -50))
+        self.image = sprites.aliens[alien_type]
+        self.rect = self.image.get_rect(center=(x, y))
         if alien_type == 0:
-            self.speed_y = random.uniform(1.5, 2.5) * speed_scale
+            self.speed_y = rng.uniform(1.5, 2.5) * speed_scale
             self.speed_x = 0
             self.points = 10
         elif alien_type == 1:
-            self.speed_y = random.uniform(2, 3) * speed_scale
-            self.speed_x = random.choice([-1, 1]) * random.uniform(0.5, 1.5) * speed_scale
+            self.speed_y = rng.uniform(2, 3) * speed_scale
+            self.speed_x = rng.choice([-1, 1]) * rng.uniform(0.5, 1.5) * speed_scale
             self.points = 20
         else:
-            self.speed_y = random.uniform(2.5, 3.5) * speed_scale
-            self.speed_x = math.sin(pygame.time.get_ticks() / 1000) * 2 * speed_scale
+            self.speed_y = rng.uniform(2.5, 3.5) * speed_scale
+            self.speed_x = rng.uniform(-2, 2) * speed_scale
             self.points = 30
+        if self.path != "straight":
+            self.speed_x = 0
         
-        self.shoot_cooldown = random.randint(60, 180)
-        self.wobble = random.uniform(0, math.pi * 2)
-
-    def create_alien(self):
-        surface = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        
-        if self.type == 0:
-            color = RED
-            pygame.draw.circle(surface, color, (25, 20), 18)
-            pygame.draw.circle(surface, (255, 255, 0), (17, 17), 6)
-            pygame.draw.circle(surface, (255, 255, 0), (33, 17), 6)
-            pygame.draw.circle(surface, BLACK, (17, 17), 3)
-            pygame.draw.circle(surface, BLACK, (33, 17), 3)
-            for i in range(5):
-                x = 8 + i * 8
-                pygame.draw.line(surface, color, (x, 35), (x - 3, 48), 3)
-            
-        elif self.type == 1:
-            color = PURPLE
-            pygame.draw.ellipse(surface, color, (10, 15, 30, 25))
-            pygame.draw.circle(surface, color, (25, 12), 10)
-            pygame.draw.circle(surface, (0, 255, 0), (20, 10), 4)
-            pygame.draw.circle(surface, (0, 255, 0), (30, 10), 4)
-            pygame.draw.circle(surface, BLACK, (20, 10), 2)
-            pygame.draw.circle(surface, BLACK, (30, 10), 2)
-            pygame.draw.line(surface, color, (18, 8), (12, 0), 2)
-            pygame.draw.line(surface, color, (32, 8), (38, 0), 2)
-            pygame.draw.circle(surface, (255, 255, 0), (12, 0), 2)
-            pygame.draw.circle(surface, (255, 255, 0), (38, 0), 2)
-            for i in range(3):
-                y = 20 + i * 5
-                pygame.draw.line(surface, color, (10, y), (3, y + 8), 2)
-                pygame.draw.line(surface, color, (40, y), (47, y + 8), 2)
-                
-        else:
-            color = ORANGE
-            pygame.draw.ellipse(surface, color, (5, 20, 40, 15))
-            pygame.draw.ellipse(surface, (255, 200, 0), (10, 18, 30, 10))
-            pygame.draw.ellipse(surface, (200, 100, 0), (15, 10, 20, 18))
-            pygame.draw.ellipse(surface, (255, 255, 100), (18, 12, 14, 12))
-            for i in range(4):
-                x = 12 + i * 8
-                pygame.draw.circle(surface, CYAN, (x, 27), 2)
-        
-        return surface
+        self.shoot_cooldown = rng.randint(60, 180)
+        self.phase = rng.randrange(PATH_STEPS)
+        self.alive = True
 
     def move(self):
-        self.rect.y += self.speed_y
-        if self.type >= 1:
-            self.wobble += 0.05
-            self.rect.x += math.sin(self.wobble) * 1.5
-        else:
-            self.rect.x += self.speed_x
+        dx, dy = self.path_table[self.phase]
+        self.phase = (self.phase + 1) % PATH_STEPS
+        self.rect.y += self.speed_y + dy
+        self.rect.x += self.speed_x + dx
         if self.rect.left < 0:
             self.rect.left = 0
             self.speed_x *= -1
@@ -351,75 +708,132 @@ class Alien:
     def can_shoot(self):
         self.shoot_cooldown -= 1
         if self.shoot_cooldown <= 0:
-            self.shoot_cooldown = random.randint(80, 200)
+            self.shoot_cooldown = rng.randint(80, 200)
             return True
         return False
 class AlienBullet:
-    def __init__(self, x, y):
+    __slots__ = ("width", "height", "image", "rect", "speed", "alive")
+
+    def __init__(self):
         self.width = 6
         self.height = 16
-        self.image = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        pygame.draw.ellipse(self.image, RED, (0, 0, 6, 16))
-        pygame.draw.ellipse(self.image, ORANGE, (1, 2, 4, 12))
-        pygame.draw.ellipse(self.image, YELLOW, (2, 4, 2, 8))
-        
-        self.rect = self.image.get_rect(center=(x, y))
+        self.image = sprites.alien_bullet
+        self.rect = self.image.get_rect()
         self.speed = 4
+        self.alive = False
+
+    def spawn(self, x, y):
+        self.rect.center = (x, y)
+        self.alive = True
 
     def move(self):
         self.rect.y += self.speed
 class PowerUp:
-    def __init__(self, x, y, powerup_type):
-        self.type = powerup_type
+    __slots__ = ("type", "size", "image", "rect", "speed", "wobble", "alive")
+
+    def __init__(self):
+        self.type = None
         self.size = 25
-        self.image = pygame.Surface((self.size, self.size), pygame.SRCALPHA)
-        self.create_image()
-        self.rect = self.image.get_rect(center=(x, y))
+        self.image = None
+        self.rect = pygame.Rect(0, 0, self.size, self.size)
         self.speed = POWERUP_SPEED
         self.wobble = 0
+        self.alive = False
 
-    def create_image(self):
-        if self.type == "triple":
-            pygame.draw.circle(self.image, ORANGE, (12, 12), 12)
-            pygame.draw.circle(self.image, YELLOW, (12, 12), 10)
-            font = get_font(20)
-            if font:
-                text = font.render("3X", True, BLACK)
-            else:
-                text = None
-            if text:
-                self.image.blit(text, (4, 6))
-            
-        elif self.type == "shield":
-            pygame.draw.circle(self.image, CYAN, (12, 12), 12)
-            pygame.draw.circle(self.image, BLUE, (12, 12), 10)
-            points = []
-            for i in range(6):
-                angle = math.pi / 3 * i
-                x = 12 + 7 * math.cos(angle)
-                y = 12 + 7 * math.sin(angle)
-                points.append((x, y))
-            pygame.draw.polygon(self.image, WHITE, points, 2)
+    def spawn(self, x, y, powerup_type):
+        self.type = powerup_type
+        self.image = sprites.powerups[powerup_type]
+        self.rect.center = (x, y)
+        self.wobble = 0
+        self.alive = True
 
     def move(self):
         self.rect.y += self.speed
         self.wobble += 0.1
         self.rect.x += math.sin(self.wobble) * 0.5
+class InputRecording:
+    """Seed plus one encoded (move, fire) input per simulated frame"""
+    def __init__(self, seed, inputs=None):
+        self.seed = seed
+        self.inputs = inputs if inputs is not None else []
+
+    def append(self, move, fire):
+        self.inputs.append((move + 1) * 3 + fire)
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump({"seed": self.seed, "inputs": "".join(str(code) for code in self.inputs)}, handle)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r", encoding="utf-8") as handle:
+            data = json.load(handle)
+        return cls(data["seed"], [int(code) for code in data["inputs"]])
+class ReplayPolicy:
+    """Plays back a recording frame by frame, then idles"""
+    def __init__(self, recording):
+        self.inputs = recording.inputs
+        self.index = 0
+
+    def decide(self, game):
+        if self.index >= len(self.inputs):
+            return 0, FIRE_NONE
+        code = self.inputs[self.index]
+        self.index += 1
+        return code // 3 - 1, code % 3
+class DodgeBot:
+    """Scripted policy: sidestep incoming fire, otherwise line up under the lowest alien"""
+    def __init__(self, reaction=140):
+        self.reaction = reaction
+
+    def decide(self, game):
+        player = game.player.rect
+        for bullet in game.alien_bullets:
+            if bullet.rect.bottom > player.top - self.reaction and abs(bullet.rect.centerx - player.centerx) < 40:
+                move = 1 if bullet.rect.centerx <= player.centerx else -1
+                if (move < 0 and player.left <= 0) or (move > 0 and player.right >= SCREEN_WIDTH):
+                    move = -move
+                return move, FIRE_HELD
+        target = max(game.aliens, key=lambda alien: alien.rect.bottom, default=None)
+        if target is None:
+            return 0, FIRE_HELD
+        offset = target.rect.centerx - player.centerx
+        if abs(offset) < PLAYER_SPEED:
+            return 0, FIRE_HELD
+        return (1 if offset > 0 else -1), FIRE_HELD
 class SpaceBattle:
-    def __init__(self):
-        self.player = Player()
+    def __init__(self, waves=None, leaderboard=None):
+        self.bullet_pool = EntityPool(Bullet, MAX_BULLETS)
+        self.alien_bullet_pool = EntityPool(AlienBullet, MAX_ALIEN_BULLETS)
+        self.powerup_pool = EntityPool(PowerUp, MAX_POWERUPS)
+        self.player = Player(self.bullet_pool)
         self.aliens = []
-        self.alien_bullets = []
-        self.powerups = []
-        self.stars = [Star() for _ in range(100)]
+        self.alien_bullets = self.alien_bullet_pool.active
+        self.powerups = self.powerup_pool.active
+        self.debug_overlay = debug_overlay
+        self.waves = waves or WaveScript.load(wave_script_path)
+        self.leaderboard = leaderboard
+        self.frame = 0
+        self.max_entities = 0
+        self.wave = None
+        self.wave_frame = 0
+        self.starfield = Starfield(SCREEN_WIDTH, SCREEN_HEIGHT)
         self.score = 0
         self.lives = 3
         self.level = 1
         self.particles = ParticleSystem()
         self.game_state = "playing"
-        self.spawn_timer = 0
+        self.wave_level = None
         self.aliens_killed = 0
-        self.spawn_rate = ALIEN_SPAWN_RATE
+        self.alien_grid = SpatialGrid()
+        self.alien_bullet_grid = SpatialGrid()
+        self.powerup_grid = SpatialGrid()
+        self.background = get_background((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.text_cache = TextCache()
+        self.hud_panel = pygame.Surface((SCREEN_WIDTH, 60), pygame.SRCALPHA)
+        self.hud_panel.fill((0, 0, 0, 120))
+        self.game_over_overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+        self.game_over_overlay.fill((0, 0, 0, 200))
 
     def handle_shoot_action(self):
         if self.game_state == "game_over":
@@ -427,105 +841,92 @@ class SpaceBattle:
         elif self.game_state == "playing":
             self.player.shoot()
 
-    def create_alien(self, x):
-        rand = random.random()
-        if rand < 0.55:
-            alien_type = 0
-        elif rand < 0.82:
-            alien_type = 1
-        else:
-            alien_type = 2
-
-        speed_scale = min(2.0, 1 + (self.level - 1) * 0.08)
-        return Alien(x, alien_type, speed_scale)
-
     def spawn_alien(self):
-        self.spawn_timer -= 1
-        if self.spawn_timer <= 0:
-            target_aliens = min(24, 10 + self.level * 2)
-            if len(self.aliens) < target_aliens:
-                wave_size = min(4, 2 + self.level // 3)
-                spawn_count = min(wave_size, target_aliens - len(self.aliens))
-                spawn_positions = list(range(60, SCREEN_WIDTH - 59, 70))
-                random.shuffle(spawn_positions)
-
-                for x in spawn_positions[:spawn_count]:
-                    self.aliens.append(self.create_alien(x))
-
-            self.spawn_rate = max(12, ALIEN_SPAWN_RATE - self.level * 2)
-            self.spawn_timer = self.spawn_rate
+        # every cycle is laid out afresh from the game RNG, so no two games or cycles share positions
+        if self.wave_level != self.level or self.wave_frame == 0:
+            self.wave = self.waves.compile(self.level, rng)
+            self.wave_level = self.level
+            self.wave_frame = 0
+        events = self.wave.schedule[self.wave_frame]
+        self.wave_frame = (self.wave_frame + 1) % self.wave.period
+        for x, y, alien_type, path, fire_chance in events:
+            if len(self.aliens) >= self.wave.target_aliens:
+                break
+            self.aliens.append(Alien(x, y, alien_type, self.wave.speed_scale, path, fire_chance))
 
     def move_aliens(self):
-        for alien in self.aliens[:]:
+        for alien in self.aliens:
             alien.move()
             if alien.rect.top > SCREEN_HEIGHT:
-                self.aliens.remove(alien)
+                alien.alive = False
+        compact(self.aliens)
 
     def alien_shoot(self):
         for alien in self.aliens:
-            if alien.can_shoot() and random.random() < 0.03:
-                bullet = AlienBullet(alien.rect.centerx, alien.rect.bottom)
-                self.alien_bullets.append(bullet)
+            if alien.can_shoot() and rng.random() < alien.fire_chance:
+                self.alien_bullet_pool.spawn(alien.rect.centerx, alien.rect.bottom)
 
     def update_alien_bullets(self):
-        for bullet in self.alien_bullets[:]:
+        for bullet in self.alien_bullets:
             bullet.move()
             if bullet.rect.top > SCREEN_HEIGHT:
-                self.alien_bullets.remove(bullet)
-            elif bullet.rect.colliderect(self.player.rect):
-                self.alien_bullets.remove(bullet)
-                if not self.player.shield_active:
-                    self.lives -= 1
-                    self.particles.emit(self.player.rect.centerx, self.player.rect.centery, RED, 25)
-                    if self.lives <= 0:
-                        self.game_state = "game_over"
-                else:
-                    self.particles.emit(bullet.rect.centerx, bullet.rect.centery, CYAN, 12)
+                bullet.alive = False
+        self.alien_bullet_grid.rebuild(self.alien_bullets)
+        for bullet in self.alien_bullet_grid.colliding(self.player.rect):
+            bullet.alive = False
+            if not self.player.shield_active:
+                self.lives -= 1
+                self.particles.emit(self.player.rect.centerx, self.player.rect.centery, RED, 25)
+                if self.lives <= 0 and self.game_state == "playing":
+                    self.game_state = "game_over"
+                    if self.leaderboard:
+                        self.leaderboard.submit(self.score)
+            else:
+                self.particles.emit(bullet.rect.centerx, bullet.rect.centery, CYAN, 12)
+        self.alien_bullet_pool.compact()
 
     def check_collisions(self):
-        for bullet in self.player.bullets[:]:
-            for alien in self.aliens[:]:
-                if bullet.rect.colliderect(alien.rect):
-                    if bullet in self.player.bullets:
-                        self.player.bullets.remove(bullet)
-                    self.aliens.remove(alien)
-                    self.score += alien.points
-                    self.aliens_killed += 1
-                    if alien.type == 0:
-                        self.particles.emit(alien.rect.centerx, alien.rect.centery, RED, 20)
-                    elif alien.type == 1:
-                        self.particles.emit(alien.rect.centerx, alien.rect.centery, PURPLE, 20)
-                    else:
-                        self.particles.emit(alien.rect.centerx, alien.rect.centery, ORANGE, 25)
-                    if self.aliens_killed % 20 == 0:
-                        self.level += 1
-                    if random.random() < 0.15:
-                        powerup_type = random.choice(["triple", "shield"])
-                        self.powerups.append(PowerUp(alien.rect.centerx, alien.rect.centery, powerup_type))
-                    break
+        self.alien_grid.rebuild(self.aliens)
+        for bullet in self.player.bullets:
+            for alien in self.alien_grid.colliding(bullet.rect):
+                bullet.alive = False
+                alien.alive = False
+                self.score += alien.points
+                self.aliens_killed += 1
+                if alien.type == 0:
+                    self.particles.emit(alien.rect.centerx, alien.rect.centery, RED, 20)
+                elif alien.type == 1:
+                    self.particles.emit(alien.rect.centerx, alien.rect.centery, PURPLE, 20)
+                else:
+                    self.particles.emit(alien.rect.centerx, alien.rect.centery, ORANGE, 25)
+                if self.aliens_killed % 20 == 0:
+                    self.level += 1
+                if rng.random() < 0.15:
+                    powerup_type = rng.choice(["triple", "shield"])
+                    self.powerup_pool.spawn(alien.rect.centerx, alien.rect.centery, powerup_type)
+                break
+        self.bullet_pool.compact()
+        compact(self.aliens)
 
     def update_powerups(self):
-        for powerup in self.powerups[:]:
+        for powerup in self.powerups:
             powerup.move()
             if powerup.rect.top > SCREEN_HEIGHT:
-                self.powerups.remove(powerup)
-            elif powerup.rect.colliderect(self.player.rect):
-                self.player.activate_powerup(powerup.type)
-                self.powerups.remove(powerup)
-                self.particles.emit(powerup.rect.centerx, powerup.rect.centery, 
-                                  ORANGE if powerup.type == "triple" else CYAN, 20)
+                powerup.alive = False
+        self.powerup_grid.rebuild(self.powerups)
+        for powerup in self.powerup_grid.colliding(self.player.rect):
+            self.player.activate_powerup(powerup.type)
+            powerup.alive = False
+            self.particles.emit(powerup.rect.centerx, powerup.rect.centery, 
+                              ORANGE if powerup.type == "triple" else CYAN, 20)
+        self.powerup_pool.compact()
 
     def update_stars(self):
-        for star in self.stars:
-            star.update()
+        self.starfield.update()
 
     def draw(self):
-        for y in range(SCREEN_HEIGHT):
-            color_value = int(10 + (y / SCREEN_HEIGHT) * 20)
-            pygame.draw.line(screen, (color_value, color_value, color_value + 20), 
-                           (0, y), (SCREEN_WIDTH, y))
-        for star in self.stars:
-            star.draw(screen)
+        screen.blit(self.background, (0, 0))
+        self.starfield.draw(screen)
         self.particles.draw(screen)
         self.player.draw(screen)
         
@@ -544,32 +945,40 @@ class SpaceBattle:
         font_small = get_font(24)
         if font is None or font_small is None:
             return
-        panel = pygame.Surface((SCREEN_WIDTH, 60), pygame.SRCALPHA)
-        panel.fill((0, 0, 0, 120))
-        screen.blit(panel, (0, 0))
-        score_text = font.render(f"SCORE: {self.score}", True, YELLOW)
-        lives_text = font.render(f"LIVES: {self.lives}", True, GREEN if self.lives > 1 else RED)
-        level_text = font.render(f"LEVEL: {self.level}", True, CYAN)
+        screen.blit(self.hud_panel, (0, 0))
+        score_text = self.text_cache.render("score", font, f"SCORE: {self.score}", YELLOW)
+        lives_text = self.text_cache.render("lives", font, f"LIVES: {self.lives}", GREEN if self.lives > 1 else RED)
+        level_text = self.text_cache.render("level", font, f"LEVEL: {self.level}", CYAN)
         
         screen.blit(score_text, (20, 15))
         screen.blit(level_text, (SCREEN_WIDTH // 2 - 60, 15))
         screen.blit(lives_text, (SCREEN_WIDTH - 150, 15))
         if self.player.powerup_active:
             time_left = self.player.powerup_timer // 60
-            powerup_text = font_small.render(f"TRIPLE SHOT: {time_left}s", True, ORANGE)
+            powerup_text = self.text_cache.render("triple", font_small, f"TRIPLE SHOT: {time_left}s", ORANGE)
             screen.blit(powerup_text, (20, 65))
         
         if self.player.shield_active:
             time_left = self.player.shield_timer // 60
-            shield_text = font_small.render(f"SHIELD: {time_left}s", True, CYAN)
+            shield_text = self.text_cache.render("shield", font_small, f"SHIELD: {time_left}s", CYAN)
             screen.blit(shield_text, (20, 90 if self.player.powerup_active else 65))
+        if self.debug_overlay:
+            self.draw_debug_overlay(font_small)
         if self.game_state == "game_over":
             self.draw_game_over()
 
+    def draw_debug_overlay(self, font):
+        pools = (("BULLETS", self.bullet_pool), ("ALIEN FIRE", self.alien_bullet_pool), ("POWERUPS", self.powerup_pool))
+        y = SCREEN_HEIGHT - 30 * len(pools) - 10
+        for name, pool in pools:
+            text = f"{name}: {len(pool.active)}/{pool.capacity} PEAK {pool.high_water}"
+            screen.blit(self.text_cache.render(name, font, text, WHITE), (20, y))
+            y += 30
+        fps_text = f"FPS: {clock.get_fps():.0f}"
+        screen.blit(self.text_cache.render("fps", font, fps_text, WHITE), (SCREEN_WIDTH - 150, SCREEN_HEIGHT - 40))
+
     def draw_game_over(self):
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 200))
-        screen.blit(overlay, (0, 0))
+        screen.blit(self.game_over_overlay, (0, 0))
         
         font_huge = get_font(90)
         font_large = get_font(48)
@@ -578,74 +987,146 @@ class SpaceBattle:
         if not (font_huge and font_large and font_medium):
             return
         
-        game_over_text = font_huge.render("GAME OVER", True, RED)
-        score_text = font_large.render(f"Final Score: {self.score}", True, YELLOW)
-        level_text = font_medium.render(f"Level Reached: {self.level}", True, CYAN)
-        kills_text = font_medium.render(f"Aliens Destroyed: {self.aliens_killed}", True, GREEN)
-        restart_text = font_large.render("Press Shoot to Continue", True, WHITE)
+        game_over_text = self.text_cache.render("game_over", font_huge, "GAME OVER", RED)
+        score_text = self.text_cache.render("final_score", font_large, f"Final Score: {self.score}", YELLOW)
+        level_text = self.text_cache.render("level_reached", font_medium, f"Level Reached: {self.level}", CYAN)
+        kills_text = self.text_cache.render("kills", font_medium, f"Aliens Destroyed: {self.aliens_killed}", GREEN)
+        restart_text = self.text_cache.render("restart", font_large, "Press Shoot to Continue", WHITE)
         
         screen.blit(game_over_text, (SCREEN_WIDTH // 2 - 230, SCREEN_HEIGHT // 2 - 120))
         screen.blit(score_text, (SCREEN_WIDTH // 2 - 160, SCREEN_HEIGHT // 2 - 20))
         screen.blit(level_text, (SCREEN_WIDTH // 2 - 130, SCREEN_HEIGHT // 2 + 30))
         screen.blit(kills_text, (SCREEN_WIDTH // 2 - 150, SCREEN_HEIGHT // 2 + 70))
         screen.blit(restart_text, (SCREEN_WIDTH // 2 - 180, SCREEN_HEIGHT // 2 + 130))
+        if self.leaderboard:
+            best_text = self.text_cache.render("best", font_medium, f"High Score: {self.leaderboard.best()}", ORANGE)
+            screen.blit(best_text, (SCREEN_WIDTH // 2 - 110, SCREEN_HEIGHT // 2 + 190))
 
     def reset_game(self):
-        self.player = Player()
+        self.bullet_pool.reset()
+        self.alien_bullet_pool.reset()
+        self.powerup_pool.reset()
+        self.player = Player(self.bullet_pool)
         self.aliens = []
-        self.alien_bullets = []
-        self.powerups = []
         self.score = 0
         self.lives = 3
         self.level = 1
         self.game_state = "playing"
-        self.spawn_timer = 0
+        self.wave_level = None
         self.aliens_killed = 0
-        self.spawn_rate = ALIEN_SPAWN_RATE
 
-    def run(self):
+    def step(self, move=0, fire=FIRE_NONE):
+        if fire == FIRE_PRESSED:
+            self.handle_shoot_action()
+        if self.game_state != "playing":
+            return
+        if move < 0:
+            self.player.move("left")
+        elif move > 0:
+            self.player.move("right")
+        if fire == FIRE_HELD:
+            self.player.shoot()
+        self.spawn_alien()
+        self.player.update_bullets()
+        self.player.update_powerups()
+        self.move_aliens()
+        self.alien_shoot()
+        self.update_alien_bullets()
+        self.check_collisions()
+        self.update_powerups()
+        self.particles.update()
+        self.update_stars()
+        self.frame += 1
+        entities = len(self.aliens) + len(self.alien_bullets) + len(self.player.bullets) + len(self.powerups)
+        if entities > self.max_entities:
+            self.max_entities = entities
+
+    def read_controls(self):
+        move = 0
+        held = False
+        keys = pygame.key.get_pressed()
+        if keys[pygame.K_LEFT] or keys[pygame.K_a]:
+            move -= 1
+        if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
+            move += 1
+        if joystick:
+            axis_x = joystick.get_axis(0)
+            if axis_x < -JOYSTICK_DEADZONE:
+                move = -1
+            elif axis_x > JOYSTICK_DEADZONE:
+                move = 1
+            held = joystick.get_button(0)  # A / bottom face button
+        return move, held
+
+    def run(self, policy=None, recording=None, recording_path=None):
         running = True
         while running:
+            fire = FIRE_NONE
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
+                    if recording:
+                        recording.save(recording_path)
                     pygame.quit()
                     sys.exit()
                 elif event.type == pygame.KEYDOWN:
                     if event.key in (pygame.K_SPACE, pygame.K_a):
-                        self.handle_shoot_action()
+                        fire = FIRE_PRESSED
                     elif event.key == pygame.K_r and self.game_state == "game_over":
-                        self.reset_game()
+                        fire = FIRE_PRESSED
+                    elif event.key == pygame.K_F3:
+                        self.debug_overlay = not self.debug_overlay
                 elif event.type == pygame.JOYBUTTONDOWN and event.button == 0:
-                    self.handle_shoot_action()
-
-            if self.game_state == "playing":
-                keys = pygame.key.get_pressed()
-                if keys[pygame.K_LEFT] or keys[pygame.K_a]:
-                    self.player.move("left")
-                if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
-                    self.player.move("right")
-                if joystick:
-                    axis_x = joystick.get_axis(0)
-                    if axis_x < -JOYSTICK_DEADZONE:
-                        self.player.move("left")
-                    elif axis_x > JOYSTICK_DEADZONE:
-                        self.player.move("right")
-                    if joystick.get_button(0):  # A / bottom face button
-                        self.player.shoot()
-                self.spawn_alien()
-                self.player.update_bullets()
-                self.player.update_powerups()
-                self.move_aliens()
-                self.alien_shoot()
-                self.update_alien_bullets()
-                self.check_collisions()
-                self.update_powerups()
-                self.particles.update()
-                self.update_stars()
+                    fire = FIRE_PRESSED
+
+            move, held = self.read_controls()
+            if fire == FIRE_NONE and held and self.game_state == "playing":
+                fire = FIRE_HELD
+            if policy:
+                move, fire = policy.decide(self)
+            if recording:
+                recording.append(move, fire)
+            self.step(move, fire)
             self.draw()
             pygame.display.flip()
             clock.tick(60)
 
+def simulate(seed, policy, waves=None, max_frames=60 * 60 * 10, sample_every=60):
+    """Run one uncapped, undrawn game and return balancing statistics"""
+    rng.seed(seed)
+    fx_rng.seed(seed)
+    game = SpaceBattle(waves)
+    score_curve = []
+    while game.game_state == "playing" and game.frame < max_frames:
+        move, fire = policy.decide(game)
+        game.step(move, fire)
+        if game.frame % sample_every == 0:
+            score_curve.append(game.score)
+    return {
+        "seed": seed,
+        "survived_frames": game.frame,
+        "survived": game.game_state == "playing",
+        "score": game.score,
+        "score_curve": score_curve,
+        "level": game.level,
+        "aliens_killed": game.aliens_killed,
+        "max_entities": game.max_entities,
+    }
+
 if __name__ == "__main__":
-    game = SpaceBattle()
-    game.run()
+    replay_path = os.environ.get('SPACE_BATTLE_REPLAY')
+    recording_path = os.environ.get('SPACE_BATTLE_RECORD')
+    replay = InputRecording.load(replay_path) if replay_path else None
+    if replay:
+        seed = replay.seed
+    elif os.environ.get('SPACE_BATTLE_SEED'):
+        seed = int(os.environ['SPACE_BATTLE_SEED'])
+    else:
+        seed = random.randrange(2 ** 31)
+    rng.seed(seed)
+    fx_rng.seed(seed)
+    game = SpaceBattle(leaderboard=Leaderboard('space-battle'))
+    game.run(
+        policy=ReplayPolicy(replay) if replay else None,
+        recording=InputRecording(seed) if recording_path else None,
+        recording_path=recording_path,
+    )
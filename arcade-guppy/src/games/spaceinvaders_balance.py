@@ -0,0 +1,103 @@
+"""Headless Space Battle balancing runs.
+
+Plays many seeded games per difficulty setting over a process pool and
+reports survival time, score curve, level reached and peak entity count.
+
+    python spaceinvaders_balance.py --runs 16 --minutes 5
+    python spaceinvaders_balance.py --replay run.json --json results.json
+"""
+import argparse
+import itertools
+import json
+import os
+import statistics
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+os.environ["SPACE_BATTLE_HEADLESS"] = "1"
+os.environ.setdefault("ARCADE_EMBEDDED", "1")
+
+SPAWN_RATES = (45, 35, 25)
+SPEED_CAPS = (1.5, 2.0, 2.5)
+FIRE_CHANCES = (0.02, 0.03, 0.05)
+FPS = 60
+
+
+def run_trial(task):
+    import spaceinvaders
+
+    difficulty, seed, max_frames, replay_path = task
+    waves = spaceinvaders.WaveScript.load(spaceinvaders.wave_script_path).with_difficulty(**difficulty)
+    if replay_path:
+        policy = spaceinvaders.ReplayPolicy(spaceinvaders.InputRecording.load(replay_path))
+    else:
+        policy = spaceinvaders.DodgeBot()
+    return difficulty, spaceinvaders.simulate(seed, policy, waves, max_frames, sample_every=FPS)
+
+
+def summarize(difficulty, results):
+    curve_length = max(len(result["score_curve"]) for result in results)
+    mean_curve = []
+    for second in range(curve_length):
+        samples = [result["score_curve"][second] for result in results if second < len(result["score_curve"])]
+        mean_curve.append(round(statistics.mean(samples)))
+    survival = [result["survived_frames"] / FPS for result in results]
+    return {
+        **difficulty,
+        "runs": len(results),
+        "survival_mean_s": round(statistics.mean(survival), 1),
+        "survival_median_s": round(statistics.median(survival), 1),
+        "survived_all": sum(result["survived"] for result in results),
+        "score_mean": round(statistics.mean(result["score"] for result in results)),
+        "level_mean": round(statistics.mean(result["level"] for result in results), 1),
+        "level_max": max(result["level"] for result in results),
+        "max_entities": max(result["max_entities"] for result in results),
+        "score_curve": mean_curve,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=8, help="seeded games per difficulty setting")
+    parser.add_argument("--minutes", type=float, default=5.0, help="simulated time limit per game")
+    parser.add_argument("--seed", type=int, default=1, help="first seed; runs use consecutive seeds")
+    parser.add_argument("--workers", type=int, default=None, help="process pool size (default: CPU count)")
+    parser.add_argument("--spawn-rates", type=int, nargs="+", default=SPAWN_RATES)
+    parser.add_argument("--speed-caps", type=float, nargs="+", default=SPEED_CAPS)
+    parser.add_argument("--fire-chances", type=float, nargs="+", default=FIRE_CHANCES)
+    parser.add_argument("--replay", help="drive every run with a recorded input file instead of the bot")
+    parser.add_argument("--json", help="also write the full report to this path")
+    args = parser.parse_args()
+
+    max_frames = int(args.minutes * 60 * FPS)
+    difficulties = [
+        {"spawn_rate": spawn_rate, "speed_cap": speed_cap, "fire_chance": fire_chance}
+        for spawn_rate, speed_cap, fire_chance in itertools.product(args.spawn_rates, args.speed_caps, args.fire_chances)
+    ]
+    tasks = [
+        (difficulty, args.seed + run, max_frames, args.replay)
+        for difficulty in difficulties
+        for run in range(args.runs)
+    ]
+
+    grouped = {}
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for difficulty, result in pool.map(run_trial, tasks, chunksize=max(1, args.runs // 2)):
+            grouped.setdefault(tuple(difficulty.items()), []).append(result)
+
+    report = [summarize(dict(key), results) for key, results in grouped.items()]
+    print(f"{'spawn':>5} {'speed':>5} {'fire':>5} | {'surv s':>7} {'median':>7} {'alive':>5} {'score':>6} {'level':>5} {'peak':>4}")
+    for row in report:
+        print(
+            f"{row['spawn_rate']:>5} {row['speed_cap']:>5} {row['fire_chance']:>5} | "
+            f"{row['survival_mean_s']:>7} {row['survival_median_s']:>7} {row['survived_all']:>2}/{row['runs']:<2} "
+            f"{row['score_mean']:>6} {row['level_mean']:>5} {row['max_entities']:>4}"
+        )
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())